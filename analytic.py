@@ -0,0 +1,153 @@
+"""
+Exact outcome distribution of games where both players follow `greedy_max_damage`.
+
+The greedy policy only looks at the attacker's own hand and mana, so each player's game unfolds independently
+of the opponent's: only its own draws matter. Bleeding out is deterministic too, decks run out after the same
+number of draws whatever is drawn. So for each player, the own turn `K` at which it would win is computed alone,
+by dynamic programming over `(deck, hand, damage dealt)` where decks and hands are histograms of mana costs:
+cards of the same cost are interchangeable, so all draw orders leading to the same multisets are merged.
+The first player wins if `K0 <= K1`, as its n-th turn comes before the n-th turn of the second player.
+
+    python analytic.py --validate 20000
+"""
+from collections import namedtuple, defaultdict
+
+from game import RuleSet, DEFAULT_RULES
+from simulation import MAX_TURNS
+
+Distribution = namedtuple('Distribution', ['wins', 'unfinished', 'turns'])
+
+
+def _draws(deck, hand, max_hand_size):
+    """`(deck, hand, probability)` after drawing a card from `deck`, with the 'Overload' rule"""
+    cards_left = sum(deck)
+    if not cards_left:
+        # 'Bleeding out' only hurts the player drawing, counted apart
+        return [(deck, hand, 1.0)]
+
+    keeping = sum(hand) < max_hand_size
+    draws = []
+    for cost, count in enumerate(deck):
+        if count:
+            drawn_deck = deck[:cost] + (count - 1,) + deck[cost + 1:]
+            drawn_hand = hand[:cost] + (hand[cost] + 1,) + hand[cost + 1:] if keeping else hand
+            draws.append((drawn_deck, drawn_hand, count / cards_left))
+    return draws
+
+
+def _greedy_turn(hand, mana, memo):
+    """`(hand, damage, played)` after playing the most expensive affordable card until the turn finishes"""
+    key = (hand, mana)
+    if key in memo:
+        return memo[key]
+
+    remaining = list(hand)
+    damage = 0
+    played = False
+    while True:
+        cost = next((cost for cost in range(min(mana, len(remaining) - 1), -1, -1) if remaining[cost]), None)
+        if cost is None:
+            break
+        remaining[cost] -= 1
+        mana -= cost
+        damage += cost
+        played = True
+        if mana == 0:
+            break
+
+    memo[key] = result = (tuple(remaining), damage, played)
+    return result
+
+
+def winning_turns(seat, rules: RuleSet = DEFAULT_RULES, max_turns=MAX_TURNS) -> dict:
+    """
+    Probability that `seat` wins on each of its own turns, against an opponent that never attacks
+    but bleeds out on time. The missing probability is for never winning within `max_turns`.
+    """
+    size = len(rules.cost_histogram)
+    draws_before_bleeding = len(rules.start_cards_cost) - rules.opening_hand
+    health = rules.start_health
+    memo = {}
+
+    openings = {(rules.cost_histogram, (0,) * size): 1.0}
+    for _ in range(0, rules.opening_hand):
+        opened = defaultdict(float)
+        for (deck, hand), probability in openings.items():
+            for drawn_deck, drawn_hand, draw_probability in _draws(deck, hand, rules.max_hand_size):
+                opened[drawn_deck, drawn_hand] += probability * draw_probability
+        openings = opened
+    states = {(deck, hand, 0): probability for (deck, hand), probability in openings.items()}
+
+    wins = {}
+    own_turns = (max_turns + 1) // 2 if seat == 0 else max_turns // 2
+    for turn in range(1, own_turns + 1):
+        # The first player starts without drawing nor mana
+        own_draws = turn - 1 if seat == 0 else turn
+        # Turns the opponent finished before this one, drawing on each but the first turn of the first player
+        opponent_turns = turn - 1 if seat == 0 else turn
+        opponent_draws = opponent_turns if seat == 0 else opponent_turns - 1
+        opponent_bleeding = max(0, opponent_draws - draws_before_bleeding)
+        mana = min(own_draws, rules.max_mana_slots)
+
+        next_states = defaultdict(float)
+        won = 0.0
+        for (deck, hand, damage), probability in states.items():
+            drawn = _draws(deck, hand, rules.max_hand_size) if own_draws else [(deck, hand, 1.0)]
+            for drawn_deck, drawn_hand, draw_probability in drawn:
+                played_hand, dealt, played = _greedy_turn(drawn_hand, mana, memo)
+                total = damage + dealt
+                if played and total + opponent_bleeding >= health:
+                    won += probability * draw_probability
+                elif any(drawn_deck) or any(played_hand):
+                    next_states[drawn_deck, played_hand, total] += probability * draw_probability
+                # Else out of cards for good: never wins
+        if won:
+            wins[turn] = won
+        states = next_states
+    return wins
+
+
+def outcome_distribution(rules: RuleSet = DEFAULT_RULES, max_turns=MAX_TURNS) -> Distribution:
+    """Win probability of each seat, probability of a game still running after `max_turns`, game lengths"""
+    first, second = winning_turns(0, rules, max_turns), winning_turns(1, rules, max_turns)
+
+    def at_least(wins, turn):
+        # Includes never winning
+        return 1.0 - sum(probability for won_turn, probability in wins.items() if won_turn < turn)
+
+    turns = {}
+    for turn, probability in first.items():
+        turns[2 * turn - 1] = probability * at_least(second, turn)
+    for turn, probability in second.items():
+        turns[2 * turn] = probability * at_least(first, turn + 1)
+
+    wins = [sum(turns[turn] for turn in turns if turn % 2), sum(turns[turn] for turn in turns if not turn % 2)]
+    return Distribution(wins, 1.0 - sum(wins), dict(sorted(turns.items())))
+
+
+def mean_turns(distribution: Distribution) -> float:
+    """Mean length of the games that finish"""
+    finished = sum(distribution.turns.values())
+    return sum(turns * probability for turns, probability in distribution.turns.items()) / finished
+
+
+if __name__ == '__main__':
+    import argparse
+    import random
+    import time
+
+    from simulation import simulate, greedy_max_damage
+
+    parser = argparse.ArgumentParser(description='Exact outcome of greedy games, checked against sampled games')
+    parser.add_argument('--validate', type=int, default=0, help='Number of games to sample')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    distribution = outcome_distribution()
+    print(f'Exact in {time.perf_counter() - start:.2f}s: wins={[round(p, 5) for p in distribution.wins]}, '
+          f'unfinished={distribution.unfinished:.2e}, mean_turns={mean_turns(distribution):.3f}')
+
+    if args.validate:
+        report = simulate(args.validate, greedy_max_damage, greedy_max_damage, random.Random(0))
+        print(f'Sampled {report.games} games: wins={[report.win_rate(0), report.win_rate(1)]}, '
+              f'mean_turns={report.mean_turns:.3f}')
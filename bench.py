@@ -0,0 +1,301 @@
+"""
+Timings of the engine hot paths.
+
+    python bench.py run --output results.json
+    python bench.py compare baseline.json results.json
+
+A benchmark is called with a number of rounds, does its setup, and returns the nanoseconds spent in the
+`ops` operations of each round. The best of `repeat` runs is kept, as nanoseconds per operation.
+"""
+import copy
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from time import perf_counter_ns
+
+from game import Game, Player, Deck, Card
+from instrumentation import Instrumentation
+from planner import plan, brute_force, precompute
+from simulation import simulate, greedy_max_damage
+
+BENCHMARKS = {}
+THRESHOLD = 0.10
+
+
+def benchmark(name, ops=1, rounds=1000):
+    def register(function):
+        BENCHMARKS[name] = (function, ops, rounds)
+        return function
+
+    return register
+
+
+def _ready_game():
+    game = Game(Player('First', Deck()), Player('Second', Deck()))
+    game.attacker.mana_slots = game.attacker.mana = 10
+    game.attacker.hand = [Card(1), Card(2), Card(3)]
+    return game
+
+
+@benchmark('Deck()')
+def deck_construction(rounds):
+    start = perf_counter_ns()
+    for _ in range(rounds):
+        Deck()
+    return perf_counter_ns() - start
+
+
+@benchmark('Player()')
+def player_construction(rounds):
+    decks = [Deck() for _ in range(rounds)]
+    start = perf_counter_ns()
+    for deck in decks:
+        Player('Frank', deck)
+    return perf_counter_ns() - start
+
+
+@benchmark('Deck.draw_card', ops=len(Deck.START_CARDS_COST))
+def draw_card(rounds):
+    decks = [Deck() for _ in range(rounds)]
+    start = perf_counter_ns()
+    for deck in decks:
+        for _ in Deck.START_CARDS_COST:
+            deck.draw_card()
+    return perf_counter_ns() - start
+
+
+@benchmark('Deck.draw_card preshuffled', ops=len(Deck.START_CARDS_COST))
+def draw_card_preshuffled(rounds):
+    decks = [Deck(preshuffled=True) for _ in range(rounds)]
+    start = perf_counter_ns()
+    for deck in decks:
+        for _ in Deck.START_CARDS_COST:
+            deck.draw_card()
+    return perf_counter_ns() - start
+
+
+@benchmark('Player.attack', ops=3)
+def attack(rounds):
+    games = [_ready_game() for _ in range(rounds)]
+    start = perf_counter_ns()
+    for game in games:
+        attacker, victim = game.attacker, game.victim
+        for card in attacker.hand.copy():
+            attacker.attack(victim, card)
+    return perf_counter_ns() - start
+
+
+@benchmark('Game.play_card', ops=3)
+def play_card(rounds):
+    games = [_ready_game() for _ in range(rounds)]
+    start = perf_counter_ns()
+    for game in games:
+        for card in game.attacker.hand.copy():
+            game.play_card(card)
+    return perf_counter_ns() - start
+
+
+@benchmark('Game.status', ops=10)
+def status(rounds):
+    games = [_ready_game() for _ in range(rounds)]
+    start = perf_counter_ns()
+    for game in games:
+        for _ in range(10):
+            game.status
+    return perf_counter_ns() - start
+
+
+def _started_game():
+    rng = random.Random(0)
+    game = Game(Player('First', Deck(rng)), Player('Second', Deck(rng)))
+    for _ in range(0, 6):
+        game.finish_turn()
+    return game
+
+
+@benchmark('copy.deepcopy(Game)', rounds=200)
+def deepcopy_game(rounds):
+    game = _started_game()
+    start = perf_counter_ns()
+    for _ in range(rounds):
+        copy.deepcopy(game)
+    return perf_counter_ns() - start
+
+
+@benchmark('Game.clone')
+def clone_game(rounds):
+    game = _started_game()
+    start = perf_counter_ns()
+    for _ in range(rounds):
+        game.clone()
+    return perf_counter_ns() - start
+
+
+@benchmark('Game.snapshot + restore')
+def snapshot_restore(rounds):
+    game = _started_game()
+    start = perf_counter_ns()
+    for _ in range(rounds):
+        snapshot = game.snapshot()
+        game.finish_turn()
+        game.restore(snapshot)
+    return perf_counter_ns() - start
+
+
+@benchmark('Game.finish_turn + undo')
+def undo(rounds):
+    game = _started_game()
+    game.track_history()
+    start = perf_counter_ns()
+    for _ in range(rounds):
+        game.finish_turn()
+        game.undo()
+    return perf_counter_ns() - start
+
+
+def _random_hands(rounds):
+    rng = random.Random(0)
+    return [(sorted(rng.sample(Deck.START_CARDS_COST, rng.randint(0, Player.MAX_HAND_SIZE))),
+             rng.randint(0, Player.MAX_MANA_SLOTS))
+            for _ in range(rounds)]
+
+
+@benchmark('planner.plan')
+def planned(rounds):
+    precompute()
+    hands = _random_hands(rounds)
+    start = perf_counter_ns()
+    for costs, mana in hands:
+        plan(costs, mana)
+    return perf_counter_ns() - start
+
+
+@benchmark('planner.brute_force')
+def brute_forced(rounds):
+    hands = _random_hands(rounds)
+    start = perf_counter_ns()
+    for costs, mana in hands:
+        brute_force(costs, mana)
+    return perf_counter_ns() - start
+
+
+def _full_games(num_games):
+    def full_games(rounds):
+        start = perf_counter_ns()
+        for _ in range(rounds):
+            simulate(num_games, greedy_max_damage, greedy_max_damage)
+        return perf_counter_ns() - start
+
+    return full_games
+
+
+for _num_games in (1, 100, 1000):
+    benchmark(f'full game x{_num_games}', ops=_num_games, rounds=max(1, 1000 // _num_games))(_full_games(_num_games))
+
+
+@benchmark('full game x100 instrumented', ops=100, rounds=10)
+def full_games_instrumented(rounds):
+    with Instrumentation():
+        return _full_games(100)(rounds)
+
+
+FIRST_CARD = """
+from game import Game, Player, Deck
+game = Game(Player('First', Deck()), Player('Second', Deck()))
+while not game.attacker.can_play_any():
+    game.finish_turn()
+game.play_card(game.attacker.playable_cards()[0])
+"""
+
+
+def _startup(code):
+    def startup(rounds):
+        # Measured from the parent: launching the interpreter is part of the startup
+        command = [sys.executable, '-c', code]
+        start = perf_counter_ns()
+        for _ in range(rounds):
+            subprocess.run(command, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return perf_counter_ns() - start
+
+    return startup
+
+
+benchmark('startup: interpreter', rounds=10)(_startup('pass'))
+benchmark('startup: first card played', rounds=10)(_startup(FIRST_CARD))
+
+
+def run(names=None, repeat=5, scale=1.0):
+    results = {}
+    for name, (function, ops, rounds) in BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        rounds = max(1, int(rounds * scale))
+        best = min(function(rounds) for _ in range(repeat))
+        results[name] = best / (rounds * ops)
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """Benchmarks slower than the baseline by more than `threshold`, as `{name: (baseline, current, ratio)}`"""
+    regressions = {}
+    for name, current_ns in current.items():
+        baseline_ns = baseline.get(name)
+        if baseline_ns and current_ns > baseline_ns * (1 + threshold):
+            regressions[name] = (baseline_ns, current_ns, current_ns / baseline_ns)
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Time the engine hot paths and compare runs')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run')
+    run_parser.add_argument('names', nargs='*', help='Only run these benchmarks')
+    run_parser.add_argument('--output', help='Store results as JSON')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--scale', type=float, default=1.0, help='Multiply the number of rounds')
+
+    compare_parser = commands.add_parser('compare')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        results = run(args.names, args.repeat, args.scale)
+        for name, ns_per_op in results.items():
+            print(f'{name:30} {ns_per_op:12.0f} ns/op')
+        if args.output:
+            with open(args.output, 'w') as file:
+                json.dump({'commit'   : _commit(),
+                           'python'   : platform.python_version(),
+                           'timestamp': time.time(),
+                           'results'  : results}, file, indent=2)
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)['results']
+    with open(args.current) as file:
+        current = json.load(file)['results']
+    regressions = compare(baseline, current, args.threshold)
+    for name, ns_per_op in current.items():
+        flag = '  REGRESSION' if name in regressions else ''
+        print(f'{name:30} {baseline.get(name, float("nan")):12.0f} -> {ns_per_op:12.0f} ns/op{flag}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
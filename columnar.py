@@ -0,0 +1,236 @@
+"""
+Columnar store of simulated games, for analysis with NumPy.
+
+    python columnar.py export games/ --games 1000000
+    python columnar.py summary games/
+
+Two tables, each a directory of `.npy` chunks, one file per column and chunk, and a manifest per chunk:
+    games/games/<part>-<chunk>.<column>.npy
+    games/games/<part>-<chunk>.json
+    games/turns/...
+Rows of `games` are finished games, rows of `turns` are the state at the start of every turn.
+Columns of both players have one row per seat: `health` is `(rows, 2)`, `hand` is `(rows, 2, NUM_COSTS)`,
+`NUM_COSTS` being the number of mana costs of the rules the games were played by.
+
+Every worker writes its own part, so parallel writers never share a file. Stores are append-only: an export
+takes part numbers no previous export used. Chunk files are written aside and then renamed, so a file on disk
+is always complete. The manifest of a chunk is renamed last, and readers only see chunks with a manifest,
+so the store can be read while it is being written. Reads memory-map the chunks.
+"""
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from game import Game, RuleSet, DEFAULT_RULES
+from simulation import play_game, POLICIES, MAX_TURNS
+from stats import write_aside
+from tournament import game_rng
+
+NUM_COSTS = len(DEFAULT_RULES.cost_histogram)
+CHUNK_SIZE = 1 << 16
+GAMES_PER_PART = 10000
+
+# Column name -> (dtype, shape of a row)
+GAMES = {'game_id'   : (np.int64, ()),
+         'winner'    : (np.int8, ()),  # -1 when stopped after `max_turns`
+         'turns'     : (np.int16, ()),
+         'health'    : (np.int16, (2,)),
+         'mana_slots': (np.int16, (2,))}
+
+
+def turns_columns(rules: RuleSet = DEFAULT_RULES) -> dict:
+    return {'game_id'   : (np.int64, ()),
+            'turn'      : (np.int16, ()),
+            'attacker'  : (np.int8, ()),
+            'health'    : (np.int16, (2,)),
+            'mana_slots': (np.int16, (2,)),
+            'hand'      : (np.int8, (2, len(rules.cost_histogram))),
+            'deck_left' : (np.int8, (2,))}
+
+
+TURNS = turns_columns()
+TABLES = {'games': GAMES, 'turns': TURNS}
+
+
+class ChunkedTable:
+    """Rows buffered in preallocated columns, written out as a new chunk whenever `chunk_size` rows are buffered"""
+
+    def __init__(self, directory, columns, part, chunk_size=CHUNK_SIZE):
+        self.directory = directory
+        self.columns = columns
+        self.part = part
+        self.chunk_size = chunk_size
+        self.chunks = 0
+        self.rows = 0
+        self._allocate()
+        os.makedirs(directory, exist_ok=True)
+        if glob.glob(os.path.join(directory, f'{part:08d}-*')):
+            raise FileExistsError(f'Part {part} already written in {directory}')
+
+    def _allocate(self):
+        self.buffers = {name: np.zeros((self.chunk_size,) + shape, dtype)
+                        for name, (dtype, shape) in self.columns.items()}
+
+    def next_row(self) -> int:
+        """Index of a zeroed row to fill in `buffers`"""
+        if self.rows == self.chunk_size:
+            self.flush()
+        row = self.rows
+        self.rows += 1
+        return row
+
+    def flush(self):
+        if not self.rows:
+            return
+        chunk = os.path.join(self.directory, f'{self.part:08d}-{self.chunks:06d}')
+        for name, buffer in self.buffers.items():
+            write_aside(f'{chunk}.{name}.npy', lambda file: np.save(file, buffer[:self.rows]), 'wb')
+        # Columns are complete: the chunk can be read
+        write_aside(f'{chunk}.json', lambda file: json.dump({'rows': self.rows}, file))
+        self.chunks += 1
+        self.rows = 0
+        self._allocate()
+
+
+def next_part(directory) -> int:
+    """First part number not used yet by any table of the store in `directory`"""
+    parts = [int(os.path.basename(path).split('-')[0])
+             for table in TABLES for path in glob.glob(os.path.join(directory, table, '*-*'))]
+    return max(parts, default=-1) + 1
+
+
+def next_game_id(directory) -> int:
+    """First game id not used yet by the games of the store in `directory`"""
+    return max((int(column.max()) + 1 for column in chunks(directory, 'games', 'game_id') if len(column)), default=0)
+
+
+class GameWriter:
+    """Appends games played by `rules` and their turns to the store in `directory`, as part number `part`"""
+
+    def __init__(self, directory, part=0, chunk_size=CHUNK_SIZE, rules: RuleSet = DEFAULT_RULES):
+        self.games = ChunkedTable(os.path.join(directory, 'games'), GAMES, part, chunk_size)
+        self.turns = ChunkedTable(os.path.join(directory, 'turns'), turns_columns(rules), part, chunk_size)
+
+    def add_turn(self, game_id, game: Game, turn):
+        table = self.turns
+        row = table.next_row()
+        buffers = table.buffers
+        buffers['game_id'][row] = game_id
+        buffers['turn'][row] = turn
+        buffers['attacker'][row] = 0 if game.attacker is game.player_0 else 1
+        hands = buffers['hand'][row]
+        for seat, player in enumerate((game.player_0, game.player_1)):
+            buffers['health'][row, seat] = player.health
+            buffers['mana_slots'][row, seat] = player.mana_slots
+            buffers['deck_left'][row, seat] = player.deck.cards_left()
+            for card in player.hand:
+                hands[seat, card.mana_cost] += 1
+
+    def add_game(self, game_id, game: Game, winner, turns):
+        table = self.games
+        row = table.next_row()
+        buffers = table.buffers
+        buffers['game_id'][row] = game_id
+        buffers['winner'][row] = -1 if winner is None else winner
+        buffers['turns'][row] = turns
+        for seat, player in enumerate((game.player_0, game.player_1)):
+            buffers['health'][row, seat] = player.health
+            buffers['mana_slots'][row, seat] = player.mana_slots
+
+    def close(self):
+        self.games.flush()
+        self.turns.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+
+def export_part(directory, part, policy_0, policy_1, seed, start, stop, max_turns=MAX_TURNS,
+                chunk_size=CHUNK_SIZE, rules: RuleSet = DEFAULT_RULES, first_game_id=0):
+    """
+    Play games `start` to `stop` of `seed` and write them as part number `part`.
+    Game `index` is stored with the id `first_game_id + index`.
+    """
+    with GameWriter(directory, part, chunk_size, rules) as writer:
+        for index in range(start, stop):
+            game_id = first_game_id + index
+            games = []
+            result = play_game(policy_0, policy_1, game_rng(seed, index), max_turns, on_start=games.append,
+                               rules=rules, on_turn=lambda game, turn: writer.add_turn(game_id, game, turn))
+            writer.add_game(game_id, games[0], result.winner, result.turns)
+    return stop - start
+
+
+def export(directory, num_games, policy_0, policy_1, seed=0, workers=None, games_per_part=GAMES_PER_PART,
+           max_turns=MAX_TURNS, chunk_size=CHUNK_SIZE, rules: RuleSet = DEFAULT_RULES):
+    """
+    Play `num_games` across a process pool, each worker writing its own parts, appended to the store.
+    Game ids follow those of the games already in the store.
+    """
+    first_part = next_part(directory)
+    first_game_id = next_game_id(directory)
+    parts = [(first_part + start // games_per_part, start, min(start + games_per_part, num_games))
+             for start in range(0, num_games, games_per_part)]
+    if workers == 1:
+        for part, start, stop in parts:
+            export_part(directory, part, policy_0, policy_1, seed, start, stop, max_turns, chunk_size, rules,
+                        first_game_id)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(export_part, directory, part, policy_0, policy_1, seed, start, stop, max_turns,
+                                   chunk_size, rules, first_game_id)
+                   for part, start, stop in parts]
+        for future in futures:
+            future.result()
+
+
+def chunks(directory, table, column) -> list:
+    """Memory-mapped chunks of a column, in the order the games were written"""
+    manifests = sorted(glob.glob(os.path.join(directory, table, '*.json')))
+    return [np.load(f'{manifest[:-len(".json")]}.{column}.npy', mmap_mode='r') for manifest in manifests]
+
+
+def read_column(directory, table, column, rules: RuleSet = DEFAULT_RULES) -> np.ndarray:
+    """Whole column in memory, `rules` only giving the shape of an empty column"""
+    dtype, shape = {'games': GAMES, 'turns': turns_columns(rules)}[table][column]
+    column_chunks = chunks(directory, table, column)
+    if not column_chunks:
+        return np.zeros((0,) + shape, dtype)
+    return np.concatenate(column_chunks)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Write games to a columnar store, or summarize a store')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export_parser = commands.add_parser('export')
+    export_parser.add_argument('directory')
+    export_parser.add_argument('--games', type=int, default=100000)
+    export_parser.add_argument('--p0', choices=sorted(POLICIES), default='greedy')
+    export_parser.add_argument('--p1', choices=sorted(POLICIES), default='greedy')
+    export_parser.add_argument('--seed', default='0')
+    export_parser.add_argument('--workers', type=int, default=None)
+    summary_parser = commands.add_parser('summary')
+    summary_parser.add_argument('directory')
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        start_time = time.perf_counter()
+        export(args.directory, args.games, POLICIES[args.p0], POLICIES[args.p1], args.seed, args.workers)
+        print(f'Exported {args.games} games in {time.perf_counter() - start_time:.1f}s')
+    else:
+        winners = read_column(args.directory, 'games', 'winner')
+        turns = read_column(args.directory, 'turns', 'turn')
+        print(f'{len(winners)} games, {len(turns)} turns')
+        print(f'Wins: {np.bincount(winners[winners >= 0], minlength=2)}, unfinished: {np.sum(winners < 0)}')
+        print(f'Mean hand per cost at turn 10: '
+              f'{read_column(args.directory, "turns", "hand")[turns == 10].sum(axis=1).mean(axis=0).round(2)}')
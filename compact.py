@@ -0,0 +1,134 @@
+import random
+from array import array
+
+from game import Game, Player, Deck, Card, InvalidMove, GameError, DEFAULT_RULES
+
+
+class CompactPlayer:
+    """
+    Same default rules as `Player`, but deck and hand are `array('b')` of mana costs.
+    Cards of the same cost are interchangeable, so a card is identified by its cost.
+    """
+    __slots__ = ('name', 'deck', 'hand', 'mana_slots', 'mana', 'health', 'rng')
+
+    def __init__(self, name, rng=random):
+        self.name = name
+        self.deck = array('b', DEFAULT_RULES.start_cards_cost)
+        self.hand = array('b')
+        self.mana_slots = 0
+        self.mana = 0
+        self.health = DEFAULT_RULES.start_health
+        self.rng = rng
+
+        for _ in range(0, DEFAULT_RULES.opening_hand):
+            self._draw_card()
+
+    @classmethod
+    def from_player(cls, player: Player) -> 'CompactPlayer':
+        if player.rules != DEFAULT_RULES:
+            raise ValueError('Compact players only play by the default rules!')
+        compact = cls.__new__(cls)
+        compact.name = player.name
+        compact.deck = array('b', [card.mana_cost for card in player.deck.cards])
+        compact.hand = array('b', [card.mana_cost for card in player.hand])
+        compact.mana_slots = player.mana_slots
+        compact.mana = player.mana
+        compact.health = player.health
+        compact.rng = player.deck.rng
+        return compact
+
+    def to_player(self) -> Player:
+        # Nothing drawn from `rng`: converting does not change the games to come
+        deck = Deck.from_cards([Card(cost) for cost in self.deck], self.rng)
+        player = Player(self.name, deck, draw_opening_hand=False)
+        player.hand = [Card(cost) for cost in self.hand]
+        player.mana_slots = self.mana_slots
+        player.mana = self.mana
+        player.health = self.health
+        return player
+
+    def _draw_card(self):
+        deck = self.deck
+        if deck:
+            rand_index = self.rng.randint(0, len(deck) - 1)
+            deck[rand_index], deck[-1] = deck[-1], deck[rand_index]
+            cost = deck.pop()
+            if len(self.hand) < DEFAULT_RULES.max_hand_size:
+                self.hand.append(cost)
+        elif self.health > 0:
+            # 'Bleeding out' special rule
+            self.health -= 1
+
+    def new_turn(self):
+        self._draw_card()
+        if self.mana_slots < DEFAULT_RULES.max_mana_slots:
+            self.mana_slots += 1
+        self.mana = self.mana_slots
+
+    def can_play_any(self) -> bool:
+        return bool(self.hand) and min(self.hand) <= self.mana
+
+    def attack(self, victim: 'CompactPlayer', cost: int):
+        if victim is self:
+            raise InvalidMove('Can not attack self')
+        if cost not in self.hand:
+            raise InvalidMove('Card is not in Hand!')
+        if self.mana < cost:
+            raise InvalidMove('Not enough Mana!')
+
+        self.mana -= cost
+        victim.health = max(victim.health - cost, 0)
+        self.hand.remove(cost)
+
+
+class CompactGame:
+    __slots__ = ('player_0', 'player_1', 'attacker', 'game_finished')
+
+    def __init__(self, player_0: CompactPlayer, player_1: CompactPlayer):
+        self.player_0 = player_0
+        self.player_1 = player_1
+
+        self.game_finished = False
+        self.attacker = self.player_0
+
+    @classmethod
+    def from_game(cls, game: Game) -> 'CompactGame':
+        compact = cls(CompactPlayer.from_player(game.player_0), CompactPlayer.from_player(game.player_1))
+        compact.game_finished = game.game_finished
+        if game.attacker is game.player_1:
+            compact.attacker = compact.player_1
+        return compact
+
+    def to_game(self) -> Game:
+        game = Game(self.player_0.to_player(), self.player_1.to_player())
+        game.game_finished = self.game_finished
+        if self.attacker is self.player_1:
+            game.attacker = game.player_1
+        return game
+
+    @property
+    def victim(self):
+        if self.attacker is self.player_0:
+            return self.player_1
+        else:
+            return self.player_0
+
+    def play_card(self, cost: int):
+        if self.game_finished:
+            raise GameError('Can not play after game is finished!')
+
+        try:
+            self.attacker.attack(self.victim, cost)
+        except InvalidMove as e:
+            raise GameError(e)
+
+        if self.victim.health == 0:
+            self.game_finished = True
+
+        if self.attacker.mana == 0 or not self.attacker.can_play_any():
+            self.finish_turn()
+
+    def finish_turn(self):
+        if not self.game_finished:
+            self.attacker = self.victim
+            self.attacker.new_turn()
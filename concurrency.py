@@ -0,0 +1,148 @@
+"""
+Sharing a game between threads.
+
+`SynchronizedGame` applies moves one at a time and as a whole under a lock, then publishes the new `Game.status`.
+Readers only ever see a published status: a read-only mapping of immutable values, replaced as a whole
+by a single reference assignment. Reading never takes the lock, so spectators never hold up moves.
+
+    python concurrency.py --readers 8 --moves 100000
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from game import Game, Player, Deck, GameError
+
+
+class SynchronizedGame:
+    def __init__(self, game: Game):
+        self._game = game
+        self._lock = threading.Lock()
+        self._status = game.status
+
+    @property
+    def status(self):
+        """Last published status, never in the middle of a move"""
+        return self._status
+
+    @contextmanager
+    def move(self):
+        """
+        Exclusive access to the game, for moves made of several calls, changes to the players included.
+        The status is published once the block is over. A block failing half-way is undone
+        and the status is left as it was.
+        """
+        with self._lock:
+            game = self._game
+            snapshot = game.snapshot()
+            try:
+                yield game
+            except BaseException:
+                game.restore(snapshot)
+                raise
+            self._status = game.status
+
+    def play_card(self, card):
+        with self.move() as game:
+            game.play_card(card)
+
+    def play_card_of_cost(self, mana_cost):
+        """Cards are only identified by index or cost from outside, the hand may have changed meanwhile"""
+        with self.move() as game:
+            card = next((card for card in game.attacker.hand if card.mana_cost == mana_cost), None)
+            if card is None:
+                raise GameError('Card is not in Hand!')
+            game.play_card(card)
+
+    def finish_turn(self):
+        with self.move() as game:
+            game.finish_turn()
+
+    def undo(self):
+        with self.move() as game:
+            game.undo()
+
+
+def check_status(status):
+    """Broken rules of the game in `status`, as messages"""
+    errors = []
+    for name, player in status['players'].items():
+        if not 0 <= player['health'] <= 30:
+            errors.append(f'{name}: health {player["health"]}')
+        if not 0 <= player['mana'] <= player['mana_slots'] <= Player.MAX_MANA_SLOTS:
+            errors.append(f'{name}: mana {player["mana"]} of {player["mana_slots"]}')
+        if len(player['hand']) > Player.MAX_HAND_SIZE:
+            errors.append(f'{name}: {len(player["hand"])} cards in hand')
+    if status['finished'] != (status['winner'] is not None):
+        errors.append(f'finished: {status["finished"]}, winner: {status["winner"]}')
+    return errors
+
+
+def stress(num_readers=4, num_moves=10000, seed=0):
+    """
+    One writer makes random moves while `num_readers` threads keep reading the status.
+    A finished game is taken back a few moves with `undo`, so the game, and its versions, go on.
+    Returns `(reads, elapsed, errors)`, errors being broken rules and versions going back.
+    """
+    rng = random.Random(seed)
+    game = Game(Player('First', Deck(rng)), Player('Second', Deck(rng)))
+    game.track_history()
+    synchronized = SynchronizedGame(game)
+    done = threading.Event()
+    reads = [0] * num_readers
+    errors = []
+
+    def read(index):
+        last_version = -1
+        count = 0
+        while not done.is_set():
+            status = synchronized.status
+            if status['version'] < last_version:
+                errors.append(f'Version went back from {last_version} to {status["version"]}')
+            last_version = status['version']
+            errors.extend(check_status(status))
+            count += 1
+        reads[index] = count
+
+    def write():
+        for _ in range(num_moves):
+            with synchronized.move() as moving:
+                if moving.game_finished:
+                    try:
+                        for _ in range(rng.randint(1, 10)):
+                            moving.undo()
+                    except GameError:
+                        # Back to the start of the game
+                        pass
+                    continue
+                playable = moving.attacker.playable_cards()
+                if playable and rng.random() < 0.8:
+                    moving.play_card(rng.choice(playable))
+                else:
+                    moving.finish_turn()
+
+    readers = [threading.Thread(target=read, args=(index,)) for index in range(num_readers)]
+    start = time.perf_counter()
+    for reader in readers:
+        reader.start()
+    try:
+        write()
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+    return sum(reads), time.perf_counter() - start, errors
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Read the status from many threads while moves are made')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--moves', type=int, default=100000)
+    args = parser.parse_args()
+
+    reads, elapsed, errors = stress(args.readers, args.moves)
+    print(f'{args.moves} moves and {reads} reads in {elapsed:.2f}s: '
+          f'{args.moves / elapsed:.0f} moves/sec, {reads / elapsed:.0f} reads/sec, {len(errors)} errors')
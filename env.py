@@ -0,0 +1,172 @@
+"""
+Gym-style environments to train agents on the game, without depending on `gym`.
+
+Observations are float32 vectors of `OBSERVATION_SIZE`, seen by the player to act:
+    own health, mana, mana slots,
+    number of cards of each mana cost in hand (NUM_COSTS values),
+    opponent health, mana slots, hand size,
+    cards left in own deck, in opponent deck
+Action `c` plays a card of mana cost `c`, action `FINISH_TURN` finishes the turn.
+Sizes follow the `RuleSet` of the game, the constants below are those of the default rules.
+Playing a card that is not in hand or not affordable raises `GameError`: see `action_mask`.
+
+Without `opponent`, the agent plays both seats (self-play) and the reward goes to the player who acted:
+1 for the winning card, 0 otherwise. With an `opponent` policy, the agent always plays seat 0, the opponent's turns
+are played within `step`, and a loss is rewarded -1.
+"""
+import random
+
+import numpy as np
+
+from game import Game, Player, Deck, GameError, RuleSet, DEFAULT_RULES
+from simulation import MAX_TURNS
+from tournament import game_rng
+
+
+def num_costs(rules: RuleSet = DEFAULT_RULES) -> int:
+    """Number of mana costs, from 0 to the highest: also the `FINISH_TURN` action"""
+    return len(rules.cost_histogram)
+
+
+def observation_size(rules: RuleSet = DEFAULT_RULES) -> int:
+    return 3 + num_costs(rules) + 3 + 2
+
+
+NUM_COSTS = num_costs()
+FINISH_TURN = NUM_COSTS
+NUM_ACTIONS = NUM_COSTS + 1
+OBSERVATION_SIZE = observation_size()
+
+
+def observation(game: Game) -> list:
+    attacker, victim = game.attacker, game.victim
+    hand = [0] * num_costs(game.rules)
+    for card in attacker.hand:
+        hand[card.mana_cost] += 1
+    return [attacker.health, attacker.mana, attacker.mana_slots,
+            *hand,
+            victim.health, victim.mana_slots, len(victim.hand),
+            attacker.deck.cards_left(), victim.deck.cards_left()]
+
+
+def action_mask(game: Game) -> list:
+    attacker = game.attacker
+    finish_turn = num_costs(game.rules)
+    mask = [False] * (finish_turn + 1)
+    mana = attacker.mana
+    for card in attacker.hand:
+        if card.mana_cost <= mana:
+            mask[card.mana_cost] = True
+    mask[finish_turn] = True
+    return mask
+
+
+class Env:
+    def __init__(self, opponent=None, max_turns=MAX_TURNS, rng=None, rules: RuleSet = DEFAULT_RULES):
+        self.opponent = opponent
+        self.max_turns = max_turns
+        self.rng = rng or random.Random()
+        self.rules = rules
+        self.finish_turn_action = num_costs(rules)
+        self.num_actions = self.finish_turn_action + 1
+        self.observation_size = observation_size(rules)
+        self.game = None
+        self.turns = 0
+
+    def reset(self, seed=None):
+        """Start a new game, returns `(observation, info)`"""
+        if seed is not None:
+            self.rng = random.Random(seed)
+        self.game = Game(Player('0', Deck(self.rng, rules=self.rules)), Player('1', Deck(self.rng, rules=self.rules)))
+        self.turns = 1
+        return self.observe(), self._info()
+
+    def observe(self) -> np.ndarray:
+        return np.array(observation(self.game), dtype=np.float32)
+
+    def action_mask(self) -> np.ndarray:
+        return np.array(action_mask(self.game), dtype=bool)
+
+    def step(self, action):
+        """Returns `(observation, reward, terminated, truncated, info)`"""
+        reward, terminated, truncated = self._step(action)
+        return self.observe(), reward, terminated, truncated, self._info()
+
+    def _step(self, action):
+        game = self.game
+        if game is None or game.game_finished:
+            raise GameError('Call reset to start a new game!')
+
+        self._act(action)
+        if game.game_finished:
+            return 1.0, True, False
+
+        if self.opponent is not None:
+            while game.attacker is game.player_1:
+                card = self.opponent(game, self.rng)
+                self._act(self.finish_turn_action if card is None else card.mana_cost)
+                if game.game_finished:
+                    return -1.0, True, False
+        return 0.0, False, self.turns > self.max_turns
+
+    def _act(self, action):
+        game = self.game
+        attacker = game.attacker
+        if action == self.finish_turn_action:
+            game.finish_turn()
+        else:
+            card = next((card for card in attacker.hand if card.mana_cost == action), None)
+            if card is None:
+                raise GameError('Card is not in Hand!')
+            game.play_card(card)
+        if game.attacker is not attacker:
+            self.turns += 1
+
+    def _info(self):
+        return {'player': 0 if self.game.attacker is self.game.player_0 else 1, 'turns': self.turns}
+
+
+class VecEnv:
+    """
+    `num_envs` environments stepped together. Results are written to the same preallocated arrays at every step:
+    `observations`, `rewards`, `terminated`, `truncated`, `action_masks`, and `players`, the seat to act.
+    A finished game is replaced by a new one within `step`: its row of `observations` is then the new game's.
+    """
+
+    def __init__(self, num_envs, opponent=None, max_turns=MAX_TURNS, seed=0, rules: RuleSet = DEFAULT_RULES):
+        self.envs = [Env(opponent, max_turns, game_rng(seed, index), rules) for index in range(0, num_envs)]
+        self.observations = np.zeros((num_envs, observation_size(rules)), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.terminated = np.zeros(num_envs, dtype=bool)
+        self.truncated = np.zeros(num_envs, dtype=bool)
+        self.action_masks = np.zeros((num_envs, num_costs(rules) + 1), dtype=bool)
+        self.players = np.zeros(num_envs, dtype=np.int8)
+
+    @property
+    def num_envs(self):
+        return len(self.envs)
+
+    def reset(self) -> np.ndarray:
+        for index, env in enumerate(self.envs):
+            env.reset()
+            self._observe(index, env)
+        self.rewards[:] = 0
+        self.terminated[:] = False
+        self.truncated[:] = False
+        return self.observations
+
+    def step(self, actions):
+        """Returns `(observations, rewards, terminated, truncated)`, the same arrays at every step"""
+        rewards, terminated, truncated = self.rewards, self.terminated, self.truncated
+        for index, (env, action) in enumerate(zip(self.envs, np.asarray(actions).tolist())):
+            rewards[index], terminated[index], truncated[index] = env._step(action)
+            if terminated[index] or truncated[index]:
+                env.reset()
+            self._observe(index, env)
+        return self.observations, rewards, terminated, truncated
+
+    def _observe(self, index, env: Env):
+        game = env.game
+        self.observations[index] = observation(game)
+        self.action_masks[index] = action_mask(game)
+        self.players[index] = 0 if game.attacker is game.player_0 else 1
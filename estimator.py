@@ -0,0 +1,99 @@
+import math
+import os
+import random
+import time
+from collections import namedtuple
+
+from game import Game
+from simulation import play_out, greedy_max_damage, MAX_TURNS
+
+Estimate = namedtuple('Estimate', ['win_probability', 'low', 'high', 'rollouts'])
+
+Z_95 = 1.96
+BATCH_SIZE = 50
+
+
+def wilson_interval(score, rollouts, z=Z_95):
+    if not rollouts:
+        return 0.0, 1.0
+    p = score / rollouts
+    denominator = 1 + z * z / rollouts
+    center = (p + z * z / (2 * rollouts)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / rollouts + z * z / (4 * rollouts * rollouts)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def rollout_batch(game: Game, seat, policy, seed, start, count, max_turns=MAX_TURNS):
+    """Score of `seat` over `count` rollouts: 1 per win, 0.5 per game still running after `max_turns`"""
+    score = 0.0
+    for index in range(start, start + count):
+        rng = random.Random(f'{seed}:{index}')
+        result = play_out(game.clone(rng), policy, policy, rng, max_turns)
+        if result.winner is None:
+            score += 0.5
+        elif result.winner == seat:
+            score += 1
+    return score
+
+
+def estimate(game: Game, player_name=None, policy=greedy_max_damage, seed=0, z=Z_95, target_half_width=0.02,
+             budget_ms=None, max_rollouts=100000, batch_size=BATCH_SIZE, executor=None, parallelism=None):
+    """
+    Stream `Estimate`s of the probability that `player_name` (the current player by default) wins,
+    with both players following `policy` from now on.
+    Stops once the confidence interval is narrower than `2 * target_half_width`, once `budget_ms` is spent,
+    or after `max_rollouts`. With an `executor`, up to `parallelism` batches of rollouts (one per CPU by default)
+    run at once in its threads or processes.
+    """
+    if player_name is None:
+        player_name = game.attacker.name
+    if player_name not in (game.player_0.name, game.player_1.name):
+        raise ValueError(f'No player named {player_name!r} in the game')
+    seat = 0 if game.player_0.name == player_name else 1
+
+    if game.game_finished:
+        won = float(game.attacker.name == player_name)
+        yield Estimate(won, won, won, 0)
+        return
+
+    # Stripped of listeners and of the global random module, so that it can be sent to other processes
+    game = game.clone(random.Random(seed))
+    parallelism = parallelism or os.cpu_count() or 1
+    deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+    batches = [(start, min(batch_size, max_rollouts - start)) for start in range(0, max_rollouts, batch_size)]
+    score = 0.0
+    rollouts = 0
+
+    def results():
+        if executor is None:
+            for start, count in batches:
+                yield rollout_batch(game, seat, policy, seed, start, count), count
+            return
+
+        in_flight = []
+        for start, count in batches:
+            in_flight.append((executor.submit(rollout_batch, game, seat, policy, seed, start, count), count))
+            if len(in_flight) >= parallelism:
+                future, count = in_flight.pop(0)
+                yield future.result(), count
+        for future, count in in_flight:
+            yield future.result(), count
+
+    for batch_score, count in results():
+        score += batch_score
+        rollouts += count
+        low, high = wilson_interval(score, rollouts, z)
+        yield Estimate(score / rollouts, low, high, rollouts)
+
+        if (high - low) / 2 <= target_half_width:
+            break
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+
+
+def estimate_win_probability(game: Game, player_name=None, **kwargs) -> Estimate:
+    """Last of the streamed estimates"""
+    last = None
+    for last in estimate(game, player_name, **kwargs):
+        pass
+    return last
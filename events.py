@@ -0,0 +1,158 @@
+import mmap
+import os
+import struct
+from collections import deque
+
+from game import Game, Player, Deck, Event
+
+# game id, event, seat of the player concerned, value, padding
+RECORD = struct.Struct('<IBBBx')
+
+
+class EventLog:
+    """
+    Append-only log of game events with one fixed-width record per event.
+    Without `path` the records stay in memory, see `getvalue`.
+    Games appended to an existing log are numbered after the games already in it.
+    """
+
+    def __init__(self, path=None, buffer_size=1 << 20):
+        self.path = path
+        self.buffer = bytearray()
+        self.buffer_size = buffer_size
+        self.games = 0
+        self._file = None
+        if path is not None:
+            if os.path.exists(path):
+                # Records appended after a record cut short would not line up
+                size = os.path.getsize(path)
+                os.truncate(path, size - size % RECORD.size)
+                self.games = max((game_id + 1 for game_id, *_ in read_events(path)), default=0)
+            self._file = open(path, 'ab')
+
+    def attach(self, game: Game) -> int:
+        """Record every event of a game that has not started yet, opening hands included"""
+        game_id = self.games
+        self.games += 1
+
+        player_0 = game.player_0
+        buffer = self.buffer
+        pack = RECORD.pack
+
+        def listener(event, player, value):
+            buffer.extend(pack(game_id, event, 0 if player is player_0 else 1, value))
+            if len(buffer) >= self.buffer_size:
+                self.flush()
+
+        for player in (game.player_0, game.player_1):
+            for card in player.hand:
+                listener(Event.DRAW, player, card.mana_cost)
+            player.listener = listener
+        game.listener = listener
+        return game_id
+
+    def flush(self):
+        if self._file is not None:
+            self._file.write(self.buffer)
+            del self.buffer[:]
+
+    def getvalue(self) -> bytes:
+        return bytes(self.buffer)
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.close()
+
+
+def read_events(path):
+    """Map the log in memory and iterate over its `(game_id, event, seat, value)` records"""
+    file_size = os.path.getsize(path)
+    if not file_size:
+        return
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        complete = file_size - file_size % RECORD.size
+        # A record cut short by an interrupted write is left out, at the cost of a copy
+        yield from RECORD.iter_unpack(mapped if complete == file_size else mapped[:complete])
+
+
+class ScriptedDeck(Deck):
+    """Hands out cards following recorded costs instead of drawing at random"""
+
+    def __init__(self, costs):
+        super().__init__()
+        self.script = deque(costs)
+
+    def draw_card(self):
+        if not self.cards:
+            raise RuntimeError('Can not draw card! Deck is empty')
+
+        cost = self.script.popleft()
+        cards = self._own_cards()
+        index = next(index for index, card in enumerate(cards) if card.mana_cost == cost)
+        cards[index], cards[-1] = cards[-1], cards[index]
+        return cards.pop()
+
+
+def replay_game(records) -> Game:
+    """Rebuild a game from its `(event, seat, value)` records"""
+    draws = ([], [])
+    for event, seat, value in records:
+        if event == Event.DRAW or event == Event.OVERLOAD:
+            draws[seat].append(value)
+
+    game = Game(Player('0', ScriptedDeck(draws[0])), Player('1', ScriptedDeck(draws[1])))
+    players = (game.player_0, game.player_1)
+    for event, seat, value in records:
+        if event == Event.CARD_PLAYED:
+            game.play_card(next(card for card in game.attacker.hand if card.mana_cost == value))
+        elif event == Event.TURN_END and game.attacker is players[seat]:
+            # Turns finished automatically by `play_card` are already over
+            game.finish_turn()
+    return game
+
+
+def replay(events):
+    """Replay `(game_id, event, seat, value)` records, yielding `(game_id, game)` as soon as a game is won"""
+    pending = {}
+    for game_id, event, seat, value in events:
+        records = pending.setdefault(game_id, [])
+        records.append((event, seat, value))
+        if event == Event.WIN:
+            yield game_id, replay_game(pending.pop(game_id))
+    for game_id, records in pending.items():
+        yield game_id, replay_game(records)
+
+
+if __name__ == '__main__':
+    import argparse
+    import tempfile
+    import time
+
+    from simulation import play_game, greedy_max_damage
+
+    parser = argparse.ArgumentParser(description='Record greedy games to an event log and time their replay')
+    parser.add_argument('--games', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'events.bin')
+        with EventLog(path) as log:
+            for _ in range(args.games):
+                play_game(greedy_max_damage, greedy_max_damage, on_start=log.attach)
+
+        num_events = os.path.getsize(path) // RECORD.size
+        start = time.perf_counter()
+        for _ in replay(read_events(path)):
+            pass
+        elapsed = time.perf_counter() - start
+
+    print(f'Replayed {args.games} games ({num_events} events) in {elapsed:.2f}s: '
+          f'{args.games / elapsed:.0f} games/sec, {num_events / elapsed:.0f} events/sec')
@@ -56,8 +56,11 @@ Basic Logic for UI:
 3. Display: "Game finished! Winner is {winner}"
 
 """
+import os
 import random
-from uuid import uuid4, UUID
+from enum import IntEnum
+from itertools import count
+from types import MappingProxyType
 
 
 class InvalidMove(Exception):
@@ -68,57 +71,371 @@ class GameError(Exception):
     pass
 
 
+class Event(IntEnum):
+    """What a listener of `Player` and `Game` is told about, along with the player concerned and a value"""
+    DRAW = 1  # cost of the drawn card
+    OVERLOAD = 2  # cost of the discarded card
+    BLEED_OUT = 3  # damage taken
+    MANA_REFILL = 4  # mana after refill
+    CARD_PLAYED = 5  # cost of the card
+    DAMAGE = 6  # damage taken
+    TURN_END = 7
+    WIN = 8
+
+
 class Card:
+    """
+    Cards are told apart by `id`, a number unique within the process, and `origin`, a random number
+    drawn once per process. Cards pickled from another process never equal local cards.
+    Ids are taken from `_ids` shifted by `BATCH_BITS`, so that `batch` reserves the ids of a whole deck at once.
+    A `uuid` is only generated when asked for, e.g. to expose the card outside the process.
+    Every deck has cards of its own, only clones and snapshots of a deck share them.
+    """
+    __slots__ = ('mana_cost', 'attack_power', 'id', 'origin', '_uuid')
+
     mana_cost: int
     attack_power: int
-    uuid: UUID
+    id: int
+    origin: int
+
+    BATCH_BITS = 8
+
+    _ids = count()
+    _origin = int.from_bytes(os.urandom(8), 'little')
 
     def __init__(self, mana_cost):
         self.mana_cost = mana_cost
         self.attack_power = mana_cost
-        self.uuid = uuid4()
+        self.id = next(Card._ids) << Card.BATCH_BITS
+        self.origin = Card._origin
+
+    @classmethod
+    def batch(cls, costs) -> list:
+        """New cards of the given `costs`, in order, built without going through `__init__`"""
+        if len(costs) > 1 << Card.BATCH_BITS:
+            return [cls(cost) for cost in costs]
+
+        first_id = next(Card._ids) << Card.BATCH_BITS
+        origin = Card._origin
+        new = cls.__new__
+        cards = []
+        for card_id, cost in enumerate(costs, first_id):
+            card = new(cls)
+            card.mana_cost = card.attack_power = cost
+            card.id = card_id
+            card.origin = origin
+            cards.append(card)
+        return cards
+
+    @property
+    def uuid(self) -> 'UUID':
+        try:
+            return self._uuid
+        except AttributeError:
+            # Imported on first use only, most processes never need it
+            from uuid import uuid4
+
+            self._uuid = uuid4()
+            return self._uuid
 
     def __eq__(self, other):
-        return self.__class__ == other.__class__ and self.uuid == other.uuid
+        return self.__class__ == other.__class__ and self.id == other.id and self.origin == other.origin
+
+    def __hash__(self):
+        return hash(self.id)
 
     def __repr__(self):
         return f'Card<{self.mana_cost}>'
 
 
-class Deck:
-    START_CARDS_COST = [0, 0, 1, 1, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 5, 5, 6, 6, 7, 8]
+def _new_card_origin():
+    # A forked child continues the ids of its parent
+    Card._origin = int.from_bytes(os.urandom(8), 'little')
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_new_card_origin)
+
+
+class RuleSet:
+    """
+    Rules of a game, shared by its `Deck`s, `Player`s and `Game`. Rule sets can not be changed.
+    Tables derived from the rules are computed once, when the rule set is created.
+    """
+    FIELDS = ('start_cards_cost', 'max_mana_slots', 'max_hand_size', 'start_health', 'opening_hand')
+    __slots__ = FIELDS + ('cost_histogram',)
+
+    start_cards_cost: tuple
+    max_mana_slots: int
+    max_hand_size: int
+    start_health: int
+    opening_hand: int
+    # Number of cards in the deck for each mana cost, from 0 to the highest cost
+    cost_histogram: tuple
 
-    def __init__(self):
-        self.cards = []
-        for cost in self.START_CARDS_COST:
-            self.cards.append(Card(cost))
+    def __init__(self, start_cards_cost=(0, 0, 1, 1, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 5, 5, 6, 6, 7, 8),
+                 max_mana_slots=10, max_hand_size=5, start_health=30, opening_hand=3):
+        costs = tuple(start_cards_cost)
+        if any(cost < 0 for cost in costs):
+            raise ValueError('Mana costs can not be negative!')
+        if start_health <= 0:
+            raise ValueError('Players must start with some health!')
+
+        histogram = [0] * (max(costs, default=0) + 1)
+        for cost in costs:
+            histogram[cost] += 1
+
+        # Immutable: attributes can only be set through `object`
+        initialize = object.__setattr__
+        initialize(self, 'start_cards_cost', costs)
+        initialize(self, 'max_mana_slots', max_mana_slots)
+        initialize(self, 'max_hand_size', max_hand_size)
+        initialize(self, 'start_health', start_health)
+        initialize(self, 'opening_hand', opening_hand)
+        initialize(self, 'cost_histogram', tuple(histogram))
+
+    def _fields(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'Can not change the rules: {name}')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'Can not change the rules: {name}')
+
+    def __reduce__(self):
+        return RuleSet, self._fields()
+
+    def __eq__(self, other):
+        return self.__class__ == other.__class__ and self._fields() == other._fields()
+
+    def __hash__(self):
+        return hash(self._fields())
+
+    def __repr__(self):
+        return 'RuleSet(' + ', '.join(f'{name}={getattr(self, name)!r}' for name in self.FIELDS) + ')'
+
+
+DEFAULT_RULES = RuleSet()
+
+
+class Deck:
+    # Costs of the default rules only, decks are built from `rules.start_cards_cost`
+    START_CARDS_COST = list(DEFAULT_RULES.start_cards_cost)
+
+    def __init__(self, rng=random, preshuffled=False, rules: RuleSet = DEFAULT_RULES):
+        """
+        `rng` provides `randint`, like `random.Random`.
+        A `preshuffled` deck is shuffled once by `rng.shuffle` and then drawn from the top, so
+        `rng` may also be a `numpy.random.Generator`.
+        """
+        self._setup(Card.batch(rules.start_cards_cost), rng, preshuffled, rules)
+        if preshuffled:
+            rng.shuffle(self.cards)
+
+    @classmethod
+    def from_cards(cls, cards: list, rng=random, preshuffled=False, rules: RuleSet = DEFAULT_RULES) -> 'Deck':
+        """Deck holding `cards` as they are: nothing is drawn from `rng` nor shuffled"""
+        deck = cls.__new__(cls)
+        deck._setup(cards, rng, preshuffled, rules)
+        return deck
+
+    def _setup(self, cards, rng, preshuffled, rules):
+        self.rng = rng
+        self.preshuffled = preshuffled
+        self.rules = rules
+        self.cards = cards
+        # `cards` may be shared with clones and snapshots, it is then copied before being modified
+        self._shared = False
+
+    def _own_cards(self) -> list:
+        if self._shared:
+            self.cards = self.cards.copy()
+            self._shared = False
+        return self.cards
 
     def draw_card(self):
         if not self.cards:
             raise RuntimeError('Can not draw card! Deck is empty')
+        if self.preshuffled:
+            return self._own_cards().pop()
 
-        rand_index = random.randint(0, len(self.cards) - 1)
-        return self.cards.pop(rand_index)
+        # Order of the deck does not matter: swap the drawn card with the last one to pop in O(1)
+        cards = self._own_cards()
+        rand_index = self.rng.randint(0, len(cards) - 1)
+        cards[rand_index], cards[-1] = cards[-1], cards[rand_index]
+        return cards.pop()
 
     def cards_left(self) -> int:
         return len(self.cards)
 
+    def clone(self, rng=None) -> 'Deck':
+        """
+        Copy sharing the `Card` objects, and the list of cards until either deck draws.
+        With a new `rng`, a pre-shuffled copy is shuffled again so its order is not known in advance.
+        """
+        deck = Deck.from_cards(self.cards, self.rng, self.preshuffled, self.rules)
+        deck._shared = self._shared = True
+        if rng is not None:
+            deck.rng = rng
+            if self.preshuffled:
+                rng.shuffle(deck._own_cards())
+        return deck
+
+    def snapshot(self) -> list:
+        self._shared = True
+        return self.cards
+
+    def restore(self, snapshot: list):
+        self.cards = snapshot
+        self._shared = True
+
+
+class Hand:
+    """
+    Cards indexed by identity: membership and removal are O(1).
+    Removing a card moves the last card into its place.
+    The number of cards per mana cost and the cheapest cost are kept up to date along the way,
+    and `version` counts the changes.
+    """
+
+    def __init__(self, cards=()):
+        self.version = 0
+        self._cards = []
+        self._positions = {}
+        self._cost_counts = {}
+        self.min_cost = None
+        for card in cards:
+            self.append(card)
+
+    def append(self, card: Card):
+        if card in self._positions:
+            raise ValueError(f'{card} is already in Hand')
+        self._positions[card] = len(self._cards)
+        self._cards.append(card)
+        self.version += 1
+
+        cost = card.mana_cost
+        self._cost_counts[cost] = self._cost_counts.get(cost, 0) + 1
+        if self.min_cost is None or cost < self.min_cost:
+            self.min_cost = cost
+
+    def remove(self, card: Card):
+        try:
+            position = self._positions.pop(card)
+        except KeyError:
+            raise ValueError(f'{card} is not in Hand')
+
+        last_card = self._cards.pop()
+        self.version += 1
+        if position < len(self._cards):
+            self._cards[position] = last_card
+            self._positions[last_card] = position
+
+        cost = card.mana_cost
+        remaining = self._cost_counts[cost] - 1
+        if remaining:
+            self._cost_counts[cost] = remaining
+        else:
+            del self._cost_counts[cost]
+            if cost == self.min_cost:
+                # At most one key per distinct mana cost
+                self.min_cost = min(self._cost_counts) if self._cost_counts else None
 
-class Player:
-    MAX_MANA_SLOTS = 10
-    MAX_HAND_SIZE = 5
+    def count_of_cost(self, mana_cost) -> int:
+        return self._cost_counts.get(mana_cost, 0)
+
+    def copy(self) -> list:
+        return self._cards.copy()
+
+    def __contains__(self, card):
+        return card in self._positions
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __iter__(self):
+        return iter(self._cards)
 
-    def __init__(self, name, deck):
+    def __getitem__(self, index):
+        return self._cards[index]
+
+    def __eq__(self, other):
+        if isinstance(other, Hand):
+            return self._cards == other._cards
+        return self._cards == other
+
+    def __repr__(self):
+        return repr(self._cards)
+
+
+class Player:
+    # Limits of the default rules, kept for existing callers: engines read `DEFAULT_RULES` or `rules` instead.
+    # Changing these constants has no effect, pass a `RuleSet` instead.
+    MAX_MANA_SLOTS = DEFAULT_RULES.max_mana_slots
+    MAX_HAND_SIZE = DEFAULT_RULES.max_hand_size
+
+    def __init__(self, name, deck, rules: RuleSet = None, draw_opening_hand=True):
+        """
+        Plays by the `rules` of its `deck` unless given others.
+        Without `draw_opening_hand`, the player starts with an empty hand and its deck is left untouched.
+        """
         self.deck = deck
+        self.rules = rules = deck.rules if rules is None else rules
 
         self.name = name
-        self.mana_slots = 0
-        self.mana = 0
-        self._health = 30
-        self.hand = []
+        # Counts changes to the player, those of its hand aside: see `version`
+        self._version = 0
+        self._mana_slots = 0
+        self._mana = 0
+        self._health = rules.start_health
+        self._hand = Hand()
+        self.listener = None
+
+        if draw_opening_hand:
+            for _ in range(0, rules.opening_hand):
+                self._draw_card()
+
+    def clone(self, deck: Deck) -> 'Player':
+        """Copy playing with `deck`, sharing the `Card` objects and without listener"""
+        player = Player(self.name, deck, self.rules, draw_opening_hand=False)
+        player._mana_slots = self._mana_slots
+        player._mana = self._mana
+        player._health = self._health
+        player._hand = Hand(self._hand)
+        return player
+
+    def snapshot(self):
+        return self.mana_slots, self.mana, self._health, tuple(self._hand), self.deck.snapshot()
+
+    def restore(self, snapshot):
+        self._mana_slots, self._mana, self._health, hand, deck = snapshot
+        self._hand = Hand(hand)
+        self.deck.restore(deck)
+        self._version += 1
 
-        for _ in range(0, 3):
-            self._draw_card()
+    @property
+    def version(self):
+        """Changes whenever the player does: through its methods, its setters or its hand"""
+        return self._version, self._hand.version
+
+    @property
+    def mana_slots(self):
+        return self._mana_slots
+
+    @mana_slots.setter
+    def mana_slots(self, mana_slots):
+        self._mana_slots = mana_slots
+        self._version += 1
+
+    @property
+    def mana(self):
+        return self._mana
+
+    @mana.setter
+    def mana(self, mana):
+        self._mana = mana
+        self._version += 1
 
     @property
     def health(self):
@@ -130,48 +447,132 @@ class Player:
             new_health = 0
 
         self._health = new_health
+        self._version += 1
+
+    @property
+    def hand(self) -> Hand:
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        self._hand = Hand(cards)
+        self._version += 1
 
     def _draw_card(self):
         if self.deck.cards_left():
             card = self.deck.draw_card()
-            if len(self.hand) < self.MAX_HAND_SIZE:
-                self.hand.append(card)
+            if len(self._hand) < self.rules.max_hand_size:
+                self._hand.append(card)
+                if self.listener is not None:
+                    self.listener(Event.DRAW, self, card.mana_cost)
+            elif self.listener is not None:
+                # 'Overload' special rule
+                self.listener(Event.OVERLOAD, self, card.mana_cost)
         else:
             # 'Bleeding out' special rule
             self.health -= 1
+            if self.listener is not None:
+                self.listener(Event.BLEED_OUT, self, 1)
 
     def _increment_mana_slots(self):
-        if self.mana_slots < self.MAX_MANA_SLOTS:
-            self.mana_slots += 1
+        if self._mana_slots < self.rules.max_mana_slots:
+            self._mana_slots += 1
+            self._version += 1
 
     def _refill_mana(self):
-        self.mana = self.mana_slots
+        self._mana = self._mana_slots
+        self._version += 1
+        if self.listener is not None:
+            self.listener(Event.MANA_REFILL, self, self._mana)
 
     def new_turn(self):
         self._draw_card()
         self._increment_mana_slots()
         self._refill_mana()
 
+    def can_play_any(self) -> bool:
+        min_cost = self._hand.min_cost
+        return min_cost is not None and min_cost <= self._mana
+
+    def playable_cards(self) -> list:
+        if not self.can_play_any():
+            return []
+        mana = self._mana
+        return [card for card in self._hand if card.mana_cost <= mana]
+
     def attack(self, victim: 'Player', card: Card):
         if victim == self:
             raise InvalidMove('Can not attack self')
-        if card not in self.hand:
+        if card not in self._hand:
             raise InvalidMove('Card is not in Hand!')
-        if self.mana < card.mana_cost:
+        if self._mana < card.mana_cost:
             raise InvalidMove('Not enough Mana!')
 
-        self.mana -= card.mana_cost
+        self._mana -= card.mana_cost
+        self._version += 1
         victim.health -= card.attack_power
-        self.hand.remove(card)
+        self._hand.remove(card)
+        if self.listener is not None:
+            self.listener(Event.CARD_PLAYED, self, card.mana_cost)
+            self.listener(Event.DAMAGE, victim, card.attack_power)
 
 
 class Game:
-    def __init__(self, player_0: Player, player_1: Player):
+    def __init__(self, player_0: Player, player_1: Player, rules: RuleSet = None):
+        """Both players must play by the same `rules`, those of `player_0` by default"""
+        self.rules = player_0.rules if rules is None else rules
+        if player_0.rules != self.rules or player_1.rules != self.rules:
+            raise GameError('Players must play by the rules of the game!')
+
         self.player_0 = player_0
         self.player_1 = player_1
 
         self.game_finished = False
         self.attacker = self.player_0
+        self.listener = None
+
+        self.version = 0
+        self._status = None
+        self._status_version = None
+        self._status_state = None
+        self._history = None
+
+    def clone(self, rng=None) -> 'Game':
+        """
+        Independent copy of the game, sharing the `Card` objects instead of copying them.
+        `rng` replaces the random generator of both decks in the copy.
+        """
+        player_0 = self.player_0.clone(self.player_0.deck.clone(rng))
+        player_1 = self.player_1.clone(self.player_1.deck.clone(rng))
+        game = Game(player_0, player_1)
+        game.game_finished = self.game_finished
+        game.version = self.version
+        if self.attacker is self.player_1:
+            game.attacker = player_1
+        return game
+
+    def snapshot(self):
+        """State of the game, to be given back to `restore`. Decks are only copied when they change."""
+        return (self.attacker is self.player_1, self.game_finished,
+                self.player_0.snapshot(), self.player_1.snapshot())
+
+    def restore(self, snapshot):
+        attacker_is_player_1, self.game_finished, player_0, player_1 = snapshot
+        self.player_0.restore(player_0)
+        self.player_1.restore(player_1)
+        self.attacker = self.player_1 if attacker_is_player_1 else self.player_0
+        # Versions never go back, the game changed again
+        self.version += 1
+
+    def track_history(self):
+        """Record a snapshot before each move, so that moves can be undone"""
+        if self._history is None:
+            self._history = []
+
+    def undo(self):
+        if not self._history:
+            raise GameError('Nothing to undo!')
+        self.restore(self._history.pop())
 
     @property
     def victim(self):
@@ -182,39 +583,81 @@ class Game:
 
     @property
     def status(self):
+        """
+        Read-only snapshot, only rebuilt once the game or its players changed.
+        A change made to the players directly, e.g. by `Player.new_turn`, counts as a new `version`.
+        Compare `version` to know whether anything changed since a previous snapshot.
+        """
+        state = (self.player_0.version, self.player_1.version, self.attacker is self.player_1, self.game_finished)
+        if self._status_version != self.version or self._status_state != state:
+            if self._status_version == self.version:
+                self.version += 1
+            self._status = self._build_status()
+            self._status_version = self.version
+            self._status_state = state
+        return self._status
+
+    def _build_status(self):
         def player_status(player: Player):
-            return {'health'    : player.health,
-                    'mana_slots': player.mana_slots,
-                    'mana'      : player.mana,
-                    'hand'      : player.hand}
+            return MappingProxyType({'health'    : player.health,
+                                     'mana_slots': player.mana_slots,
+                                     'mana'      : player.mana,
+                                     'hand'      : tuple(player.hand)})
 
         def winner():
             if self.game_finished:
                 return self.attacker.name
             return None
 
-        return {'current_player': self.attacker.name,
-                'players'       : {self.player_0.name: player_status(self.player_0),
-                                   self.player_1.name: player_status(self.player_1)},
-                'finished'      : self.game_finished,
-                'winner'        : winner()}
+        return MappingProxyType({'version'       : self.version,
+                                 'current_player': self.attacker.name,
+                                 'players'       : MappingProxyType(
+                                     {self.player_0.name: player_status(self.player_0),
+                                      self.player_1.name: player_status(self.player_1)}),
+                                 'finished'      : self.game_finished,
+                                 'winner'        : winner()})
 
     def play_card(self, card: Card):
         if self.game_finished:
             raise GameError('Can not play after game is finished!')
 
+        history = self._history
+        if history is None:
+            self._play_card(card)
+            return
+
+        # A turn finished by the card is undone along with it
+        history.append(self.snapshot())
+        self._history = None
+        try:
+            self._play_card(card)
+        except GameError:
+            history.pop()
+            raise
+        finally:
+            self._history = history
+
+    def _play_card(self, card: Card):
         try:
             self.attacker.attack(self.victim, card)
         except InvalidMove as e:
             raise GameError(e)
+        self.version += 1
 
         if self.victim.health == 0:
             self.game_finished = True
+            if self.listener is not None:
+                self.listener(Event.WIN, self.attacker, 0)
 
-        if self.attacker.mana == 0 or self.attacker.hand == []:
+        if self.attacker.mana == 0 or not self.attacker.can_play_any():
             self.finish_turn()
 
     def finish_turn(self):
         if not self.game_finished:
+            if self._history is not None:
+                self._history.append(self.snapshot())
+            if self.listener is not None:
+                self.listener(Event.TURN_END, self.attacker, 0)
             self.attacker = self.victim
             self.attacker.new_turn()
+            self.version += 1
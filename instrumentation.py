@@ -0,0 +1,146 @@
+"""
+Opt-in counters and timings of the game loop.
+
+    with Instrumentation() as instrumentation:
+        play_game(greedy_max_damage, greedy_max_damage)
+    print(instrumentation.to_prometheus())
+
+While enabled, the instrumented methods of `Player` and `Game` are replaced on the classes by timed wrappers.
+Disabling puts the original methods back, so nothing is left in the way of uninstrumented games.
+Timings include nested calls: `Game.play_card` includes the `Game.finish_turn` it may trigger.
+"""
+from collections import Counter
+from functools import wraps
+from time import perf_counter_ns
+from weakref import WeakKeyDictionary
+
+from game import Game, Player
+
+METHODS = [(Player, 'new_turn'),
+           (Player, '_draw_card'),
+           (Player, 'attack'),
+           (Game, 'play_card'),
+           (Game, 'finish_turn')]
+
+PREFIX = 'tcg'
+
+
+class Instrumentation:
+    """Only one instrumentation can be enabled at a time"""
+    _enabled = None
+
+    def __init__(self):
+        self._originals = {}
+        self.calls = Counter()
+        self.time_ns = Counter()
+        self.overloads = 0
+        self.bleed_out_damage = 0
+        # Number of cards played during a turn -> number of such turns
+        self.turn_lengths = Counter()
+        # Cards played by each player since their turn started
+        self._played = WeakKeyDictionary()
+
+    def reset(self):
+        self.calls.clear()
+        self.time_ns.clear()
+        self.overloads = 0
+        self.bleed_out_damage = 0
+        self.turn_lengths.clear()
+        self._played.clear()
+
+    @property
+    def enabled(self):
+        return Instrumentation._enabled is self
+
+    def enable(self):
+        if Instrumentation._enabled is not None:
+            raise RuntimeError('Instrumentation is already enabled!')
+        Instrumentation._enabled = self
+
+        around = {'_draw_card' : self._around_draw_card,
+                  'attack'     : self._around_attack,
+                  'finish_turn': self._around_finish_turn}
+        for cls, name in METHODS:
+            method = self._originals[cls, name] = cls.__dict__[name]
+            if name in around:
+                method = around[name](method)
+            setattr(cls, name, self._timed(f'{cls.__name__}.{name}', method))
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for (cls, name), method in self._originals.items():
+            setattr(cls, name, method)
+        self._originals.clear()
+        Instrumentation._enabled = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *_exc_info):
+        self.disable()
+
+    def _timed(self, label, method):
+        calls = self.calls
+        time_ns = self.time_ns
+
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                time_ns[label] += perf_counter_ns() - start
+                calls[label] += 1
+
+        return timed
+
+    def _around_draw_card(self, method):
+        def draw_card(player: Player):
+            bleeding_out = not player.deck.cards_left()
+            hand_size = len(player.hand)
+            method(player)
+            if bleeding_out:
+                self.bleed_out_damage += 1
+            elif len(player.hand) == hand_size:
+                self.overloads += 1
+
+        return draw_card
+
+    def _around_attack(self, method):
+        def attack(player: Player, victim: Player, card):
+            method(player, victim, card)
+            self._played[player] = self._played.get(player, 0) + 1
+
+        return attack
+
+    def _around_finish_turn(self, method):
+        def finish_turn(game: Game):
+            if not game.game_finished:
+                self.turn_lengths[self._played.pop(game.attacker, 0)] += 1
+            method(game)
+
+        return finish_turn
+
+    def as_dict(self):
+        return {'calls'           : dict(self.calls),
+                'time_ns'         : dict(self.time_ns),
+                'overloads'       : self.overloads,
+                'bleed_out_damage': self.bleed_out_damage,
+                'turn_lengths'    : dict(sorted(self.turn_lengths.items()))}
+
+    def to_prometheus(self, prefix=PREFIX) -> str:
+        """Prometheus text exposition format"""
+        lines = [f'# TYPE {prefix}_calls_total counter']
+        lines += [f'{prefix}_calls_total{{method="{label}"}} {count}' for label, count in sorted(self.calls.items())]
+        lines.append(f'# TYPE {prefix}_time_ns_total counter')
+        lines += [f'{prefix}_time_ns_total{{method="{label}"}} {ns}' for label, ns in sorted(self.time_ns.items())]
+        lines.append(f'# TYPE {prefix}_overloads_total counter')
+        lines.append(f'{prefix}_overloads_total {self.overloads}')
+        lines.append(f'# TYPE {prefix}_bleed_out_damage_total counter')
+        lines.append(f'{prefix}_bleed_out_damage_total {self.bleed_out_damage}')
+        lines.append(f'# TYPE {prefix}_turns_total counter')
+        lines += [f'{prefix}_turns_total{{cards_played="{cards}"}} {count}'
+                  for cards, count in sorted(self.turn_lengths.items())]
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,84 @@
+import asyncio
+import json
+import time
+
+from server import GameServer
+
+
+def choose_move(status, name):
+    player = status['players'][name]
+    affordable = [(cost, index) for index, cost in enumerate(player['hand']) if cost <= player['mana']]
+    if not affordable:
+        return {'op': 'pass'}
+    return {'op': 'play', 'card': max(affordable)[1]}
+
+
+async def play_client(host, port, table, name, latencies):
+    """Greedy player measuring the time from sending each move to receiving its outcome"""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(json.dumps({'op': 'join', 'table': table, 'name': name}).encode() + b'\n')
+
+    sent_at = None
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            message = json.loads(line)
+            if sent_at is not None and message['type'] in ('status', 'error'):
+                latencies.append(time.perf_counter() - sent_at)
+                sent_at = None
+
+            if message['type'] == 'closed':
+                break
+            if message['type'] == 'status' and not message['finished'] and message['current_player'] == name:
+                writer.write(json.dumps(choose_move(message, name)).encode() + b'\n')
+                await writer.drain()
+                sent_at = time.perf_counter()
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, tables):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(play_client(host, port, f'table-{table}', name, latencies)
+                           for table in range(tables)
+                           for name in ('First', 'Second')))
+    return latencies, time.perf_counter() - start
+
+
+def percentiles(latencies, points=(50, 90, 99)):
+    ordered = sorted(latencies)
+    if not ordered:
+        return {}
+    result = {f'p{point}': ordered[min(len(ordered) - 1, len(ordered) * point // 100)] for point in points}
+    result['max'] = ordered[-1]
+    return result
+
+
+async def main(host, port, tables):
+    server = None
+    if port is None:
+        server = await GameServer().start(host)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies, elapsed = await run_load(host, port, tables)
+    print(f'{tables} tables, {len(latencies)} moves in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} moves/sec)')
+    print({name: f'{seconds * 1000:.2f}ms' for name, seconds in percentiles(latencies).items()})
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Play greedy games against a server and report per-move latency')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help='Without it, a server is started in-process')
+    parser.add_argument('--tables', type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.host, args.port, args.tables))
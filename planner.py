@@ -0,0 +1,62 @@
+"""
+Most damaging cards to play in a turn.
+
+Cards deal damage equal to their mana cost, so the best turn spends as much mana as possible.
+Plans are looked up by `(sorted hand costs, mana)`: with at most 5 cards of costs 0 to 8 and 10 mana,
+there are only 2002 hands and 22022 keys, which `precompute` fills in advance.
+"""
+from itertools import combinations, combinations_with_replacement
+
+from game import Player, RuleSet, DEFAULT_RULES
+
+_PLANS = {}
+
+
+def _in_play_order(costs) -> tuple:
+    # Free cards first, the turn finishes by itself once mana runs out
+    return tuple(sorted(costs, key=lambda cost: (cost != 0, -cost)))
+
+
+def brute_force(costs, mana) -> tuple:
+    """
+    Costs of the cards to play, in order, by trying every subset of `costs`.
+    Among the subsets dealing the most damage, the one playing the most cards is kept to avoid overloads.
+    """
+    best = ()
+    best_key = (0, 0)
+    for size in range(1, len(costs) + 1):
+        for subset in combinations(costs, size):
+            spent = sum(subset)
+            if spent <= mana and (spent, size) > best_key:
+                best = subset
+                best_key = (spent, size)
+    return _in_play_order(best)
+
+
+def plan(costs, mana) -> tuple:
+    key = (tuple(sorted(costs)), mana)
+    try:
+        return _PLANS[key]
+    except KeyError:
+        best = _PLANS[key] = brute_force(key[0], mana)
+        return best
+
+
+def plan_turn(player: Player) -> list:
+    """Cards of `player` to play, in order"""
+    hand = player.hand.copy()
+    cards = []
+    for cost in plan([card.mana_cost for card in hand], player.mana):
+        card = next(card for card in hand if card.mana_cost == cost)
+        hand.remove(card)
+        cards.append(card)
+    return cards
+
+
+def precompute(rules: RuleSet = DEFAULT_RULES):
+    costs = [cost for cost, count in enumerate(rules.cost_histogram) if count]
+    for size in range(0, rules.max_hand_size + 1):
+        for hand in combinations_with_replacement(costs, size):
+            for mana in range(0, rules.max_mana_slots + 1):
+                plan(hand, mana)
+    return len(_PLANS)
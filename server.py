@@ -0,0 +1,247 @@
+import asyncio
+import json
+
+from game import Game, Player, Deck, GameError
+
+TURN_TIMEOUT = 30.0
+QUEUE_SIZE = 64
+
+
+def encode_status(status) -> bytes:
+    return json.dumps({'type'          : 'status',
+                       'version'       : status['version'],
+                       'current_player': status['current_player'],
+                       'players'       : {name: {'health'    : player['health'],
+                                                 'mana_slots': player['mana_slots'],
+                                                 'mana'      : player['mana'],
+                                                 'hand'      : [card.mana_cost for card in player['hand']]}
+                                          for name, player in status['players'].items()},
+                       'finished'      : status['finished'],
+                       'winner'        : status['winner']}).encode() + b'\n'
+
+
+def encode(message) -> bytes:
+    return json.dumps(message).encode() + b'\n'
+
+
+class Connection:
+    """
+    Outgoing messages go through a bounded queue drained by a dedicated task.
+    A client too slow to keep up with its queue is disconnected instead of stalling its table.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, queue_size=QUEUE_SIZE):
+        self.reader = reader
+        self.writer = writer
+        self.queue = asyncio.Queue(queue_size)
+        self.name = None
+        self.table = None
+        self._sender = asyncio.ensure_future(self._send_queued())
+
+    def send(self, data: bytes):
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.close()
+
+    async def _send_queued(self):
+        try:
+            while True:
+                data = await self.queue.get()
+                self.writer.write(data)
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def close(self):
+        self._sender.cancel()
+        self.writer.close()
+
+
+class Table:
+    def __init__(self, name, turn_timeout=TURN_TIMEOUT):
+        self.name = name
+        self.turn_timeout = turn_timeout
+        self.connections = []
+        self.game = None
+        self._timer = None
+        self._encoded_status = None
+        self._encoded_version = None
+
+    def join(self, connection: Connection):
+        if self.full:
+            raise GameError('Table is full!')
+        if any(other.name == connection.name for other in self.connections):
+            raise GameError('Name already taken at this table!')
+
+        self.connections.append(connection)
+        connection.table = self
+
+    @property
+    def full(self):
+        return len(self.connections) == 2
+
+    def start(self):
+        self.game = Game(Player(self.connections[0].name, Deck()), Player(self.connections[1].name, Deck()))
+        self._turn_started()
+
+    def play(self, connection: Connection, message):
+        game = self._check_turn(connection)
+        if message['op'] == 'pass':
+            game.finish_turn()
+        else:
+            hand = game.attacker.hand
+            index = message.get('card')
+            if not isinstance(index, int) or not 0 <= index < len(hand):
+                raise GameError('Card is not in Hand!')
+            game.play_card(hand[index])
+        self._turn_started()
+
+    def _check_turn(self, connection: Connection) -> Game:
+        if self.game is None:
+            raise GameError('Game has not started yet!')
+        if self.game.attacker.name != connection.name:
+            raise GameError('Not your turn!')
+        return self.game
+
+    def _turn_started(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.game.game_finished:
+            self._timer = asyncio.get_running_loop().call_later(self.turn_timeout, self._turn_timed_out)
+        self.broadcast_status()
+
+    def _turn_timed_out(self):
+        self._timer = None
+        self.game.finish_turn()
+        self._turn_started()
+
+    def broadcast_status(self):
+        status = self.game.status
+        if self._encoded_version != status['version']:
+            self._encoded_status = encode_status(status)
+            self._encoded_version = status['version']
+        for connection in self.connections:
+            connection.send(self._encoded_status)
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for connection in self.connections:
+            connection.table = None
+            connection.send(encode({'type': 'closed'}))
+
+
+class GameServer:
+    """
+    Hosts many tables over a line protocol, one JSON object per line:
+        {"op": "join", "table": "t1", "name": "Frank"}
+        {"op": "play", "card": <index in hand>}
+        {"op": "pass"}
+        {"op": "metrics"}
+    Every change of a game is broadcast to both players as a status message.
+    `metrics` answers with the Prometheus text dump of `instrumentation`, when given.
+    """
+
+    def __init__(self, turn_timeout=TURN_TIMEOUT, queue_size=QUEUE_SIZE, instrumentation=None):
+        self.turn_timeout = turn_timeout
+        self.queue_size = queue_size
+        self.instrumentation = instrumentation
+        self.tables = {}
+
+    async def start(self, host='127.0.0.1', port=0) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def _handle(self, reader, writer):
+        connection = Connection(reader, writer, self.queue_size)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than the stream limit: the rest of the line can not be told apart from the next one
+                    writer.write(encode({'type': 'error', 'message': 'Message too long!'}))
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    self._dispatch(connection, json.loads(line))
+                except (GameError, ValueError, KeyError) as e:
+                    connection.send(encode({'type': 'error', 'message': str(e)}))
+        except ConnectionError:
+            pass
+        finally:
+            self._leave(connection)
+            connection.close()
+
+    def _dispatch(self, connection: Connection, message):
+        if not isinstance(message, dict):
+            raise GameError('Messages must be JSON objects!')
+        op = message.get('op')
+        if op == 'join':
+            if connection.table is not None:
+                raise GameError('Already seated!')
+            name = message.get('table')
+            if not isinstance(name, str):
+                raise GameError('Table must be a string!')
+            table = self.tables.get(name)
+            if table is None:
+                table = self.tables[name] = Table(name, self.turn_timeout)
+            connection.name = str(message['name'])
+            table.join(connection)
+            connection.send(encode({'type': 'joined', 'table': name, 'seat': len(table.connections) - 1}))
+            if table.full:
+                table.start()
+        elif op in ('play', 'pass'):
+            if connection.table is None:
+                raise GameError('Join a table first!')
+            table = connection.table
+            table.play(connection, message)
+            if table.game.game_finished:
+                self._close_table(table)
+        elif op == 'metrics':
+            if self.instrumentation is None:
+                raise GameError('Instrumentation is not enabled!')
+            connection.send(encode({'type': 'metrics', 'text': self.instrumentation.to_prometheus()}))
+        else:
+            raise GameError(f'Unknown op: {op}')
+
+    def _leave(self, connection: Connection):
+        table = connection.table
+        if table is not None and self.tables.get(table.name) is table:
+            table.connections.remove(connection)
+            self._close_table(table)
+
+    def _close_table(self, table: Table):
+        table.close()
+        if self.tables.get(table.name) is table:
+            del self.tables[table.name]
+
+
+async def serve(host, port, turn_timeout, instrumentation=None):
+    server = await GameServer(turn_timeout, instrumentation=instrumentation).start(host, port)
+    print(f'Serving on {", ".join(str(socket.getsockname()) for socket in server.sockets)}')
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Host many games over a JSON line protocol')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--turn-timeout', type=float, default=TURN_TIMEOUT)
+    parser.add_argument('--instrument', action='store_true', help='Answer the metrics op')
+    args = parser.parse_args()
+
+    instrumentation = None
+    if args.instrument:
+        from instrumentation import Instrumentation
+
+        instrumentation = Instrumentation()
+        instrumentation.enable()
+    asyncio.run(serve(args.host, args.port, args.turn_timeout, instrumentation))
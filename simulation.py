@@ -0,0 +1,190 @@
+import random
+import time
+from collections import namedtuple
+
+from game import Game, Player, Deck, DEFAULT_RULES
+
+MAX_TURNS = 200
+
+GameResult = namedtuple('GameResult', ['winner', 'turns', 'bled_out'])
+
+
+def greedy_max_damage(game: Game, rng):
+    attacker = game.attacker
+    if not attacker.can_play_any():
+        return None
+
+    mana = attacker.mana
+    best = None
+    for card in attacker.hand:
+        if card.mana_cost <= mana and (best is None or card.mana_cost > best.mana_cost):
+            best = card
+    return best
+
+
+def planned_max_damage(game: Game, rng):
+    """Plays the cards dealing the most damage this turn, see `planner`"""
+    attacker = game.attacker
+    if not attacker.can_play_any():
+        return None
+
+    # Only imported by games using this policy, after the first call it is a lookup in `sys.modules`
+    from planner import plan
+
+    hand = attacker.hand
+    costs = plan([card.mana_cost for card in hand], attacker.mana)
+    if not costs:
+        return None
+    first = costs[0]
+    return next(card for card in hand if card.mana_cost == first)
+
+
+def random_legal(game: Game, rng):
+    playable = game.attacker.playable_cards()
+    # One extra slot for passing the turn
+    choice = rng.randint(0, len(playable))
+    if choice == len(playable):
+        return None
+    return playable[choice]
+
+
+def pass_early(game: Game, rng):
+    attacker = game.attacker
+    if attacker.mana < attacker.mana_slots:
+        return None
+    return greedy_max_damage(game, rng)
+
+
+POLICIES = {'greedy'    : greedy_max_damage,
+            'planned'   : planned_max_damage,
+            'random'    : random_legal,
+            'pass_early': pass_early}
+
+
+def play_game(policy_0, policy_1, rng=random, max_turns=MAX_TURNS, on_start=None, preshuffled=False,
+              rules=DEFAULT_RULES, on_turn=None) -> GameResult:
+    """
+    Play a full game without going through `Game.status`.
+    A policy is called with `(game, rng)` and returns the card to play, or `None` to finish the turn.
+    `on_start` is called with the new game before the first move.
+    """
+    game = Game(Player('0', Deck(rng, preshuffled, rules)), Player('1', Deck(rng, preshuffled, rules)))
+    if on_start is not None:
+        on_start(game)
+    return play_out(game, policy_0, policy_1, rng, max_turns, on_turn)
+
+
+def play_out(game: Game, policy_0, policy_1, rng=random, max_turns=MAX_TURNS, on_turn=None) -> GameResult:
+    """
+    Play `game` from its current state until the end, `policy_0` playing for `game.player_0`.
+    `on_turn` is called with the game and the turn number before the first move of every turn.
+    """
+    player_0 = game.player_0
+
+    turns = 1
+    bled_out = False
+    if on_turn is not None:
+        on_turn(game, turns)
+    while not game.game_finished:
+        attacker = game.attacker
+        next_deck_empty = not game.victim.deck.cards_left()
+
+        card = (policy_0 if attacker is player_0 else policy_1)(game, rng)
+        if card is None:
+            game.finish_turn()
+        else:
+            game.play_card(card)
+
+        if game.attacker is not attacker:
+            bled_out = bled_out or next_deck_empty
+            turns += 1
+            if turns > max_turns:
+                return GameResult(None, max_turns, bled_out)
+            if on_turn is not None:
+                on_turn(game, turns)
+
+    winner = 0 if game.attacker is player_0 else 1
+    return GameResult(winner, turns, bled_out)
+
+
+class SimulationReport:
+    def __init__(self):
+        self.games = 0
+        self.wins = [0, 0]
+        self.unfinished = 0
+        self.total_turns = 0
+        self.longest_game = 0
+        self.bled_out = 0
+        self.elapsed = 0.0
+
+    def add(self, result: GameResult):
+        self.games += 1
+        if result.winner is None:
+            self.unfinished += 1
+        else:
+            self.wins[result.winner] += 1
+        self.total_turns += result.turns
+        if result.turns > self.longest_game:
+            self.longest_game = result.turns
+        if result.bled_out:
+            self.bled_out += 1
+
+    def merge(self, other: 'SimulationReport'):
+        self.games += other.games
+        self.wins[0] += other.wins[0]
+        self.wins[1] += other.wins[1]
+        self.unfinished += other.unfinished
+        self.total_turns += other.total_turns
+        self.longest_game = max(self.longest_game, other.longest_game)
+        self.bled_out += other.bled_out
+
+    def win_rate(self, seat):
+        return self.wins[seat] / self.games if self.games else 0.0
+
+    @property
+    def mean_turns(self):
+        return self.total_turns / self.games if self.games else 0.0
+
+    @property
+    def bleed_out_rate(self):
+        return self.bled_out / self.games if self.games else 0.0
+
+    @property
+    def games_per_sec(self):
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return {'games'         : self.games,
+                'wins'          : list(self.wins),
+                'unfinished'    : self.unfinished,
+                'mean_turns'    : self.mean_turns,
+                'longest_game'  : self.longest_game,
+                'bleed_out_rate': self.bleed_out_rate}
+
+    def __repr__(self):
+        return (f'SimulationReport<{self.games} games, '
+                f'wins={self.wins}, unfinished={self.unfinished}, '
+                f'mean_turns={self.mean_turns:.2f}, bleed_out_rate={self.bleed_out_rate:.3f}, '
+                f'{self.games_per_sec:.0f} games/sec>')
+
+
+def simulate(num_games, policy_0, policy_1, rng=random, max_turns=MAX_TURNS, preshuffled=False) -> SimulationReport:
+    report = SimulationReport()
+    start = time.perf_counter()
+    for _ in range(num_games):
+        report.add(play_game(policy_0, policy_1, rng, max_turns, preshuffled=preshuffled))
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Play games headless and report aggregate statistics')
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--p0', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--p1', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--preshuffled', action='store_true', help='Shuffle decks once instead of drawing at random')
+    args = parser.parse_args()
+
+    print(simulate(args.games, POLICIES[args.p0], POLICIES[args.p1], preshuffled=args.preshuffled))
@@ -0,0 +1,190 @@
+import sys
+from collections import OrderedDict
+
+from game import Game, Player, Deck, DEFAULT_RULES
+
+NUM_COSTS = len(DEFAULT_RULES.cost_histogram)
+WIN, DRAW = 1.0, 0.5
+
+
+def histogram(cards):
+    counts = [0] * NUM_COSTS
+    for card in cards:
+        counts[card.mana_cost] += 1
+    return tuple(counts)
+
+
+def side_of(player: Player, with_mana=True):
+    """(health, mana_slots, mana, hand costs histogram, deck costs histogram)"""
+    return (player.health, player.mana_slots, player.mana if with_mana else 0,
+            histogram(player.hand), histogram(player.deck.cards))
+
+
+def canonical_state(game: Game):
+    """
+    The state seen from the attacker: cards only matter through their cost, and the victim's mana is
+    refilled before it can be used, so two games only differing by card identities share a state.
+    """
+    return side_of(game.attacker), side_of(game.victim, with_mana=False)
+
+
+class TranspositionTable:
+    def __init__(self, max_entries=1000000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entry_size = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        if not self._entry_size:
+            self._entry_size = _deep_size(key) + sys.getsizeof(value)
+        self.entries[key] = value
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'entries'     : len(self.entries),
+                'hits'        : self.hits,
+                'misses'      : self.misses,
+                'hit_rate'    : self.hits / lookups if lookups else 0.0,
+                'evictions'   : self.evictions,
+                'approx_bytes': sys.getsizeof(self.entries) + len(self.entries) * self._entry_size}
+
+
+def _deep_size(obj):
+    if isinstance(obj, tuple):
+        return sys.getsizeof(obj) + sum(_deep_size(item) for item in obj)
+    # Health, mana and card counts are small ints, which are shared
+    return 0
+
+
+class Solver:
+    """
+    Expectiminimax over canonical states: the attacker picks the card cost to play (or passes),
+    the draw at the start of each turn is a chance node weighted by the costs left in the deck.
+    Values are the probability that the attacker wins, a game that can never end counts as a draw.
+
+    With `horizon` set, a state `horizon` turns away is scored by the share of health left instead of being
+    searched further, which keeps large positions tractable.
+    """
+
+    def __init__(self, table_size=1000000, horizon=None):
+        self.table = TranspositionTable(table_size)
+        self.horizon = horizon
+        self._on_path = set()
+
+    def solve(self, game: Game) -> float:
+        if game.rules != DEFAULT_RULES:
+            raise ValueError('The solver only plays by the default rules!')
+        if game.game_finished:
+            return WIN
+
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, 20000))
+        try:
+            return self.value(canonical_state(game), self.horizon)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+    def value(self, state, turns_left=None):
+        key = state if turns_left is None else (state, turns_left)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        attacker, victim = state
+        if not any(attacker[3] + attacker[4] + victim[3] + victim[4]):
+            # Empty hands and decks: nobody can ever deal damage again
+            return DRAW
+        if key in self._on_path:
+            # Both players passing in a loop
+            return DRAW
+
+        self._on_path.add(key)
+        best = self._finish_turn(state, turns_left)
+        mana, hand = attacker[2], attacker[3]
+        for cost in range(min(mana, NUM_COSTS - 1), -1, -1):
+            if best == WIN:
+                break
+            if hand[cost]:
+                best = max(best, self._play_card(state, cost, turns_left))
+        self._on_path.discard(key)
+
+        self.table.put(key, best)
+        return best
+
+    def _play_card(self, state, cost, turns_left):
+        (health, mana_slots, mana, hand, deck), victim = state
+
+        victim_health = max(victim[0] - cost, 0)
+        if victim_health == 0:
+            return WIN
+
+        mana -= cost
+        hand = hand[:cost] + (hand[cost] - 1,) + hand[cost + 1:]
+        state = (health, mana_slots, mana, hand, deck), (victim_health,) + victim[1:]
+        if mana == 0 or not any(hand[:mana + 1]):
+            return self._finish_turn(state, turns_left)
+        return self.value(state, turns_left)
+
+    def _finish_turn(self, state, turns_left):
+        (health, mana_slots, _mana, hand, deck), victim = state
+        previous_attacker = (health, mana_slots, 0, hand, deck)
+
+        if turns_left is not None:
+            if turns_left == 0:
+                return health / (health + victim[0]) if health + victim[0] else DRAW
+            turns_left -= 1
+
+        victim_health, victim_slots, _victim_mana, victim_hand, victim_deck = victim
+        victim_slots = min(victim_slots + 1, DEFAULT_RULES.max_mana_slots)
+
+        cards_left = sum(victim_deck)
+        if not cards_left:
+            # 'Bleeding out' special rule
+            next_attacker = (max(victim_health - 1, 0), victim_slots, victim_slots, victim_hand, victim_deck)
+            return WIN - self.value((next_attacker, previous_attacker), turns_left)
+
+        expected = 0.0
+        hand_full = sum(victim_hand) >= DEFAULT_RULES.max_hand_size
+        for cost, count in enumerate(victim_deck):
+            if not count:
+                continue
+            deck = victim_deck[:cost] + (count - 1,) + victim_deck[cost + 1:]
+            # 'Overload' special rule
+            hand = victim_hand if hand_full else victim_hand[:cost] + (victim_hand[cost] + 1,) + victim_hand[cost + 1:]
+            next_attacker = (victim_health, victim_slots, victim_slots, hand, deck)
+            expected += count / cards_left * (WIN - self.value((next_attacker, previous_attacker), turns_left))
+        return expected
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Value of a fresh game for the first player under optimal play')
+    parser.add_argument('--horizon', type=int, default=4, help='Turns searched before scoring by health')
+    parser.add_argument('--table-size', type=int, default=1000000)
+    args = parser.parse_args()
+
+    solver = Solver(args.table_size, args.horizon)
+    start = time.perf_counter()
+    value = solver.solve(Game(Player('First', Deck()), Player('Second', Deck())))
+    print(f'First player value: {value:.4f} ({time.perf_counter() - start:.2f}s)')
+    print(solver.table.stats())
@@ -0,0 +1,177 @@
+"""
+Statistics over any number of games in constant memory.
+
+Games are played one at a time and reduced to a compact `Outcome`, which `Statistics` folds into
+fixed-size counters. The counters are checkpointed to a JSON file along the way:
+an interrupted run started again with the same checkpoint carries on from the last game saved.
+
+    python stats.py --games 100000000 --checkpoint stats.json
+"""
+import json
+import os
+import time
+from collections import namedtuple
+
+from game import Game, Player, Deck, Event, DEFAULT_RULES
+from simulation import play_out, POLICIES, MAX_TURNS
+from tournament import game_rng
+
+# Highest mana cost of a card, indexing card usage by cost
+MAX_COST = len(DEFAULT_RULES.cost_histogram) - 1
+START_HEALTH = DEFAULT_RULES.start_health
+CHECKPOINT_EVERY = 10000
+
+# `health` and `cards_played` (per mana cost) are given per seat
+Outcome = namedtuple('Outcome', ['winner', 'turns', 'health', 'cards_played'])
+
+
+def play_outcome(policy_0, policy_1, rng, max_turns=MAX_TURNS) -> Outcome:
+    game = Game(Player('0', Deck(rng)), Player('1', Deck(rng)))
+    players = (game.player_0, game.player_1)
+    cards_played = ([0] * (MAX_COST + 1), [0] * (MAX_COST + 1))
+    played_0, played_1 = cards_played
+
+    def listener(event, player, value):
+        if event == Event.CARD_PLAYED:
+            (played_0 if player is players[0] else played_1)[value] += 1
+
+    for player in players:
+        player.listener = listener
+    result = play_out(game, policy_0, policy_1, rng, max_turns)
+    return Outcome(result.winner, result.turns, (players[0].health, players[1].health), cards_played)
+
+
+def outcomes(num_games, policy_0, policy_1, seed=0, start=0, max_turns=MAX_TURNS):
+    """Outcomes of games `start` to `num_games`, each seeded by its index so that a run can be resumed"""
+    for game_index in range(start, num_games):
+        yield play_outcome(policy_0, policy_1, game_rng(seed, game_index), max_turns)
+
+
+class Statistics:
+    """Online aggregates of `Outcome`s, all of fixed size"""
+
+    def __init__(self, max_turns=MAX_TURNS):
+        self.games = 0
+        # Wins of each seat, then games stopped after `max_turns`
+        self.winners = [0, 0, 0]
+        self.turns = [0] * (max_turns + 1)
+        self.health = [[0] * (START_HEALTH + 1), [0] * (START_HEALTH + 1)]
+        self.cards_played = [[0] * (MAX_COST + 1), [0] * (MAX_COST + 1)]
+
+    def add(self, outcome: Outcome):
+        self.games += 1
+        self.winners[2 if outcome.winner is None else outcome.winner] += 1
+        self.turns[outcome.turns] += 1
+        for seat in (0, 1):
+            self.health[seat][min(outcome.health[seat], START_HEALTH)] += 1
+            totals = self.cards_played[seat]
+            for cost, count in enumerate(outcome.cards_played[seat]):
+                totals[cost] += count
+
+    def merge(self, other: 'Statistics'):
+        def add_up(totals, others):
+            for index, value in enumerate(others):
+                totals[index] += value
+
+        self.games += other.games
+        add_up(self.winners, other.winners)
+        add_up(self.turns, other.turns)
+        for seat in (0, 1):
+            add_up(self.health[seat], other.health[seat])
+            add_up(self.cards_played[seat], other.cards_played[seat])
+
+    def mean_turns(self):
+        return sum(turns * count for turns, count in enumerate(self.turns)) / self.games if self.games else 0.0
+
+    def mean_health(self, seat):
+        if not self.games:
+            return 0.0
+        return sum(health * count for health, count in enumerate(self.health[seat])) / self.games
+
+    def to_dict(self):
+        return {'games'       : self.games,
+                'winners'     : self.winners,
+                'turns'       : self.turns,
+                'health'      : self.health,
+                'cards_played': self.cards_played}
+
+    @classmethod
+    def from_dict(cls, data) -> 'Statistics':
+        statistics = cls(len(data['turns']) - 1)
+        statistics.games = data['games']
+        statistics.winners = data['winners']
+        statistics.turns = data['turns']
+        statistics.health = data['health']
+        statistics.cards_played = data['cards_played']
+        return statistics
+
+    def __repr__(self):
+        return (f'Statistics<{self.games} games, winners={self.winners}, '
+                f'mean_turns={self.mean_turns():.2f}, '
+                f'mean_health=[{self.mean_health(0):.2f}, {self.mean_health(1):.2f}]>')
+
+
+def write_aside(path, write, mode='w'):
+    """
+    Call `write` with a file opened aside from `path`, then rename it to `path`:
+    an interruption never leaves a partial file at `path`.
+    """
+    temporary = f'{path}.tmp'
+    with open(temporary, mode) as file:
+        write(file)
+    os.replace(temporary, path)
+
+
+def save_checkpoint(path, run, statistics: Statistics):
+    write_aside(path, lambda file: json.dump({'run': run, 'statistics': statistics.to_dict()}, file))
+
+
+def load_checkpoint(path, run):
+    if path is None or not os.path.exists(path):
+        return None
+    with open(path) as file:
+        checkpoint = json.load(file)
+    if checkpoint['run'] != run:
+        raise ValueError(f'Checkpoint {path} belongs to another run: {checkpoint["run"]}')
+    return Statistics.from_dict(checkpoint['statistics'])
+
+
+def collect(num_games, policy_0, policy_1, seed=0, max_turns=MAX_TURNS, checkpoint=None,
+            checkpoint_every=CHECKPOINT_EVERY) -> Statistics:
+    """
+    Statistics of `num_games` games, saved to `checkpoint` every `checkpoint_every` games and at the end.
+    Resumes from `checkpoint` when it exists. The games, and so the statistics, are the same with or without
+    interruptions.
+    """
+    run = {'policy_0' : policy_0.__name__,
+           'policy_1' : policy_1.__name__,
+           'seed'     : str(seed),
+           'max_turns': max_turns}
+    statistics = load_checkpoint(checkpoint, run) or Statistics(max_turns)
+
+    for outcome in outcomes(num_games, policy_0, policy_1, seed, statistics.games, max_turns):
+        statistics.add(outcome)
+        if checkpoint is not None and statistics.games % checkpoint_every == 0:
+            save_checkpoint(checkpoint, run, statistics)
+    if checkpoint is not None:
+        save_checkpoint(checkpoint, run, statistics)
+    return statistics
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Aggregate statistics over many games in constant memory')
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--p0', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--p1', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--seed', default='0')
+    parser.add_argument('--checkpoint', help='JSON file to save to, and to resume from')
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    statistics = collect(args.games, POLICIES[args.p0], POLICIES[args.p1], args.seed,
+                         checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every)
+    print(statistics)
+    print(f'{time.perf_counter() - start:.1f}s')
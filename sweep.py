@@ -0,0 +1,106 @@
+"""
+Balance sweeps: play the same games under every rule set of a grid.
+
+    python sweep.py --games 2000 --health 20 30 40 --hand 4 5 6 --slots 8 10 12 --opening 2 3 4
+
+Every rule set plays games seeded by their index, so rule sets are compared on the same shuffles.
+Results are cached on disk under a hash of the rule set and of the sweep parameters,
+so a grid overlapping a previous one only plays the new rule sets.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+from game import RuleSet
+from simulation import play_game, SimulationReport, POLICIES, MAX_TURNS
+from stats import write_aside
+from tournament import game_rng
+
+
+def grid(**axes) -> list:
+    """One `RuleSet` per combination of the values given for each of its fields"""
+    names = list(axes)
+    return [RuleSet(**dict(zip(names, values))) for values in product(*axes.values())]
+
+
+def rules_key(rules: RuleSet, **parameters) -> str:
+    # Derived tables follow from the other fields
+    rule_fields = {name: getattr(rules, name) for name in RuleSet.FIELDS}
+    description = json.dumps({'rules': rule_fields, **parameters}, sort_keys=True)
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def evaluate(rules: RuleSet, num_games, policy_0, policy_1, seed=0, max_turns=MAX_TURNS) -> dict:
+    report = SimulationReport()
+    for game_index in range(0, num_games):
+        report.add(play_game(policy_0, policy_1, game_rng(seed, game_index), max_turns, rules=rules))
+    return report.summary()
+
+
+def sweep(rule_sets, num_games, policy_0, policy_1, seed=0, workers=None, cache_dir=None,
+          max_turns=MAX_TURNS) -> list:
+    """Summary of the games played under each of `rule_sets`, in the same order"""
+    parameters = {'games'    : num_games,
+                  'policy_0' : policy_0.__name__,
+                  'policy_1' : policy_1.__name__,
+                  'seed'     : str(seed),
+                  'max_turns': max_turns}
+    summaries = [None] * len(rule_sets)
+    paths = [None] * len(rule_sets)
+    missing = []
+    for index, rules in enumerate(rule_sets):
+        if cache_dir is not None:
+            paths[index] = os.path.join(cache_dir, f'{rules_key(rules, **parameters)}.json')
+            if os.path.exists(paths[index]):
+                with open(paths[index]) as file:
+                    summaries[index] = json.load(file)
+                continue
+        missing.append(index)
+
+    def store(index, summary):
+        summaries[index] = summary
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_aside(paths[index], lambda file: json.dump(summary, file))
+
+    arguments = [(rule_sets[index], num_games, policy_0, policy_1, seed, max_turns) for index in missing]
+    if workers == 1:
+        for index, evaluated in zip(missing, arguments):
+            store(index, evaluate(*evaluated))
+    elif arguments:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(evaluate, *evaluated) for evaluated in arguments]
+            for index, future in zip(missing, futures):
+                store(index, future.result())
+    return summaries
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Play the same games under a grid of rule sets')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--p0', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--p1', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--seed', default='0')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache', default='.sweep-cache', help='Directory of cached results')
+    parser.add_argument('--health', type=int, nargs='+', default=[30])
+    parser.add_argument('--hand', type=int, nargs='+', default=[5])
+    parser.add_argument('--slots', type=int, nargs='+', default=[10])
+    parser.add_argument('--opening', type=int, nargs='+', default=[3])
+    args = parser.parse_args()
+
+    rule_sets = grid(start_health=args.health, max_hand_size=args.hand, max_mana_slots=args.slots,
+                     opening_hand=args.opening)
+    summaries = sweep(rule_sets, args.games, POLICIES[args.p0], POLICIES[args.p1], args.seed, args.workers,
+                      args.cache)
+
+    def imbalance(rules_and_summary):
+        return abs(rules_and_summary[1]['wins'][0] / args.games - 0.5)
+
+    for rules, summary in sorted(zip(rule_sets, summaries), key=imbalance):
+        print(f'health={rules.start_health:3} hand={rules.max_hand_size:2} slots={rules.max_mana_slots:3} '
+              f'opening={rules.opening_hand}: wins={summary["wins"]} mean_turns={summary["mean_turns"]:.2f}')
@@ -0,0 +1,72 @@
+import math
+
+import pytest
+
+from analytic import outcome_distribution, winning_turns, mean_turns, _greedy_turn, _draws
+from game import RuleSet
+from simulation import play_game, greedy_max_damage
+from tournament import game_rng
+
+
+@pytest.fixture(scope='module')
+def short_rules():
+    return RuleSet(start_health=10)
+
+
+@pytest.fixture(scope='module')
+def distribution(short_rules):
+    return outcome_distribution(short_rules)
+
+
+class TestGreedyTurn:
+    def test_most_expensive_affordable_first(self):
+        # Costs 0 to 3: one 1, one 2, one 3
+        assert _greedy_turn((0, 1, 1, 1), 4, {}) == ((0, 0, 1, 0), 4, True)
+
+    def test_turn_finishes_without_mana__free_cards_stay(self):
+        assert _greedy_turn((2, 0, 1), 2, {}) == ((2, 0, 0), 2, True)
+
+    def test_free_cards_with_mana_left(self):
+        assert _greedy_turn((2, 0, 0, 1), 4, {}) == ((0, 0, 0, 0), 3, True)
+
+    def test_nothing_affordable(self):
+        assert _greedy_turn((0, 0, 1), 1, {}) == ((0, 0, 1), 0, False)
+
+
+class TestDraws:
+    def test_probability_of_each_cost(self):
+        draws = _draws((1, 3), (0, 0), 5)
+        assert draws == [((0, 3), (1, 0), 0.25), ((1, 2), (0, 1), 0.75)]
+
+    def test_overload__card_is_lost(self):
+        assert _draws((0, 2), (5, 0), 5) == [((0, 1), (5, 0), 1.0)]
+
+    def test_empty_deck(self):
+        assert _draws((0, 0), (1, 0), 5) == [((0, 0), (1, 0), 1.0)]
+
+
+class TestOutcomeDistribution:
+    def test_probabilities_add_up(self, distribution):
+        assert sum(distribution.wins) + distribution.unfinished == pytest.approx(1.0)
+        assert sum(distribution.turns.values()) == pytest.approx(sum(distribution.wins))
+
+    def test_odd_turns_are_wins_of_the_first_player(self, distribution):
+        assert sum(p for turn, p in distribution.turns.items() if turn % 2) == pytest.approx(distribution.wins[0])
+
+    def test_second_player_never_wins_before_turn_two(self, short_rules):
+        assert min(winning_turns(1, short_rules)) >= 1
+        assert min(outcome_distribution(short_rules).turns) >= 2
+
+    def test_same_as_sampled_games(self, short_rules, distribution):
+        num_games = 4000
+        wins = [0, 0]
+        turns = 0
+        for game_index in range(0, num_games):
+            result = play_game(greedy_max_damage, greedy_max_damage, game_rng(0, game_index), rules=short_rules)
+            wins[result.winner] += 1
+            turns += result.turns
+
+        p = distribution.wins[0]
+        sigma = math.sqrt(p * (1 - p) / num_games)
+        assert wins[0] / num_games == pytest.approx(p, abs=4 * sigma)
+        assert turns / num_games == pytest.approx(mean_turns(distribution), rel=0.05)
@@ -0,0 +1,32 @@
+import json
+
+from bench import BENCHMARKS, run, compare, main
+
+
+class TestRun:
+    def test_every_benchmark_runs(self):
+        results = run(repeat=1, scale=0.001)
+        assert set(results) == set(BENCHMARKS)
+        assert all(ns_per_op > 0 for ns_per_op in results.values())
+
+    def test_only_selected_benchmarks(self):
+        assert list(run(['Deck()'], repeat=1, scale=0.01)) == ['Deck()']
+
+
+class TestCompare:
+    def test_slower_than_threshold__regression(self):
+        regressions = compare({'a': 100, 'b': 100}, {'a': 115, 'b': 105}, threshold=0.1)
+        assert list(regressions) == ['a']
+        assert regressions['a'][2] == 1.15
+
+    def test_new_benchmark__not_a_regression(self):
+        assert compare({}, {'a': 100}) == {}
+
+    def test_exit_code_flags_regressions(self, tmp_path):
+        baseline = tmp_path / 'baseline.json'
+        current = tmp_path / 'current.json'
+        baseline.write_text(json.dumps({'results': {'a': 100}}))
+        current.write_text(json.dumps({'results': {'a': 200}}))
+
+        assert main(['compare', str(baseline), str(baseline)]) == 0
+        assert main(['compare', str(baseline), str(current)]) == 1
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+from pytest import fixture
+
+from columnar import export, read_column, chunks, GameWriter, next_part
+from game import RuleSet
+from simulation import greedy_max_damage, random_legal, play_game
+from tournament import game_rng, run_tournament
+
+
+@fixture
+def store(tmp_path):
+    export(tmp_path, 30, random_legal, greedy_max_damage, seed=2, workers=1, games_per_part=7, chunk_size=50)
+    return tmp_path
+
+
+class TestPlayOutHook:
+    def test_called_once_per_turn(self):
+        turns = []
+        result = play_game(greedy_max_damage, greedy_max_damage, game_rng(0, 0),
+                           on_turn=lambda game, turn: turns.append(turn))
+        assert turns == list(range(1, result.turns + 1))
+
+
+class TestExport:
+    def test_one_row_per_game(self, store):
+        assert (read_column(store, 'games', 'game_id') == np.arange(30)).all()
+
+    def test_same_games_as_tournament(self, store):
+        report = run_tournament(30, random_legal, greedy_max_damage, seed=2, workers=1)
+        winners = read_column(store, 'games', 'winner')
+        assert list(np.bincount(winners, minlength=2)) == report.wins
+        assert read_column(store, 'games', 'turns').sum() == report.total_turns
+
+    def test_one_row_per_turn(self, store):
+        turns = read_column(store, 'turns', 'turn')
+        assert len(turns) == read_column(store, 'games', 'turns').sum()
+        assert len(chunks(store, 'turns', 'turn')) > 5
+
+    def test_first_turn(self, store):
+        turns = read_column(store, 'turns', 'turn')
+        first = turns == 1
+        assert (read_column(store, 'turns', 'health')[first] == 30).all()
+        assert (read_column(store, 'turns', 'hand')[first].sum(axis=2) == 3).all()
+        assert (read_column(store, 'turns', 'deck_left')[first] == 17).all()
+        assert (read_column(store, 'turns', 'attacker')[first] == 0).all()
+
+    def test_loser_has_no_health_left(self, store):
+        winners = read_column(store, 'games', 'winner')
+        health = read_column(store, 'games', 'health')
+        assert (health[np.arange(len(winners)), 1 - winners] == 0).all()
+
+    def test_same_store_on_many_workers(self, store, tmp_path_factory):
+        other = tmp_path_factory.mktemp('other')
+        export(other, 30, random_legal, greedy_max_damage, seed=2, workers=2, games_per_part=7, chunk_size=50)
+        for column in ('game_id', 'hand', 'health'):
+            assert (read_column(other, 'turns', column) == read_column(store, 'turns', column)).all()
+
+    def test_chunks_are_memory_mapped(self, store):
+        assert all(isinstance(chunk, np.memmap) for chunk in chunks(store, 'games', 'winner'))
+
+    def test_hand_columns_follow_the_rules(self, tmp_path):
+        rules = RuleSet(start_cards_cost=[0, 1, 2, 3] * 5, start_health=10)
+        export(tmp_path, 5, greedy_max_damage, greedy_max_damage, workers=1, rules=rules)
+        hands = read_column(tmp_path, 'turns', 'hand')
+        assert hands.shape[1:] == (2, 4)
+        assert (read_column(tmp_path, 'turns', 'health')[read_column(tmp_path, 'turns', 'turn') == 1] == 10).all()
+        assert read_column(tmp_path / 'empty', 'turns', 'hand', rules).shape == (0, 2, 4)
+
+    def test_empty_store(self, tmp_path):
+        with GameWriter(tmp_path):
+            pass
+        assert read_column(tmp_path, 'turns', 'hand').shape == (0, 2, 9)
+
+
+class TestAppendOnly:
+    def test_second_export_is_appended(self, store):
+        first = read_column(store, 'turns', 'health')
+        export(store, 10, random_legal, greedy_max_damage, seed=1, workers=1, games_per_part=7, chunk_size=50)
+        assert len(read_column(store, 'games', 'game_id')) == 40
+        assert (read_column(store, 'turns', 'health')[:len(first)] == first).all()
+
+    def test_game_ids_stay_unique_across_exports(self, store):
+        export(store, 10, random_legal, greedy_max_damage, seed=1, workers=1, games_per_part=7, chunk_size=50)
+        game_ids = read_column(store, 'games', 'game_id')
+        assert (game_ids == np.arange(40)).all()
+        assert set(read_column(store, 'turns', 'game_id')[read_column(store, 'turns', 'turn') == 1]) == \
+               set(range(40))
+
+    def test_parts_are_not_reused(self, store):
+        assert next_part(store) == 5
+        with pytest.raises(FileExistsError):
+            GameWriter(store, part=4)
+
+    def test_chunk_without_manifest__not_read(self, tmp_path):
+        games = []
+        result = play_game(greedy_max_damage, greedy_max_damage, game_rng(0, 0), on_start=games.append)
+        with GameWriter(tmp_path) as writer:
+            writer.add_game(0, games[0], result.winner, result.turns)
+        os.remove(os.path.join(tmp_path, 'games', '00000000-000000.json'))
+        assert len(read_column(tmp_path, 'games', 'winner')) == 0
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+from pytest import fixture
+
+from compact import CompactPlayer, CompactGame
+from game import Game, Player, Deck, Card, GameError, RuleSet
+from simulation import greedy_max_damage
+
+
+class TestCompactPlayer:
+    @fixture
+    def player(self):
+        return CompactPlayer('Frank')
+
+    def test_start_like_a_player(self, player):
+        assert player.health == 30
+        assert player.mana_slots == 0
+        assert len(player.hand) == 3
+        assert len(player.deck) == 17
+        assert sorted(list(player.hand) + list(player.deck)) == Deck.START_CARDS_COST
+
+    def test_has_no_instance_dict(self, player):
+        with pytest.raises(AttributeError):
+            player.some_attribute = 3
+
+    def test_hand_full__throw_card_away__overload_special_rule(self, player):
+        player.hand.extend([1, 1])
+        player.new_turn()
+        assert len(player.hand) == Player.MAX_HAND_SIZE
+        assert len(player.deck) == 16
+
+    def test_deck_empty__take_damage__bleeding_out_special_rule(self, player):
+        del player.deck[:]
+        player.new_turn()
+        assert player.health == 29
+
+    def test_to_player__same_state_without_drawing(self):
+        rng = random.Random(3)
+        compact = CompactPlayer('Frank', rng)
+        compact.health = 21
+        state = rng.getstate()
+        player = compact.to_player()
+        assert rng.getstate() == state
+        assert sorted(card.mana_cost for card in player.deck.cards) == sorted(compact.deck)
+        assert [card.mana_cost for card in player.hand] == list(compact.hand)
+        assert player.health == 21
+        assert player.deck.rng is rng
+
+
+class TestCompactGame:
+    @fixture
+    def game(self):
+        return CompactGame(CompactPlayer('First'), CompactPlayer('Second'))
+
+    def test_game_of_other_rules__throw_error(self):
+        rules = RuleSet(start_health=12, max_hand_size=7, opening_hand=6)
+        with pytest.raises(ValueError):
+            CompactGame.from_game(Game(Player('First', Deck(rules=rules)), Player('Second', Deck(rules=rules))))
+
+    def test_card_not_in_hand__throw_error(self, game):
+        del game.attacker.hand[:]
+        with pytest.raises(GameError, match=r'(?i).*not in hand.*'):
+            game.play_card(3)
+
+    def test_play_card__damage_and_finish_turn_when_no_mana_left(self, game):
+        game.attacker.hand.append(4)
+        game.attacker.mana = 4
+        game.play_card(4)
+        assert game.player_1.health == 26
+        assert game.attacker is game.player_1
+
+    def test_same_seed__same_game_as_object_model(self):
+        def greedy_compact(game: CompactGame):
+            affordable = [cost for cost in game.attacker.hand if cost <= game.attacker.mana]
+            return max(affordable) if affordable else None
+
+        for seed in range(0, 10):
+            rng = random.Random(seed)
+            game = Game(Player('First', Deck(rng)), Player('Second', Deck(rng)))
+            while not game.game_finished:
+                card = greedy_max_damage(game, rng)
+                game.finish_turn() if card is None else game.play_card(card)
+
+            rng = random.Random(seed)
+            compact = CompactGame(CompactPlayer('First', rng), CompactPlayer('Second', rng))
+            while not compact.game_finished:
+                cost = greedy_compact(compact)
+                compact.finish_turn() if cost is None else compact.play_card(cost)
+
+            assert compact.attacker.name == game.attacker.name
+            assert compact.victim.health == game.victim.health == 0
+            assert compact.attacker.health == game.attacker.health
+
+
+class TestConversion:
+    def test_round_trip(self):
+        game = Game(Player('First', Deck()), Player('Second', Deck()))
+        game.finish_turn()
+        game.player_0.health = 17
+        game.player_1.hand = [Card(2), Card(6)]
+
+        back = CompactGame.from_game(game).to_game()
+
+        assert back.attacker.name == 'Second'
+        assert back.player_0.health == 17
+        assert [card.mana_cost for card in back.player_1.hand] == [2, 6]
+        assert back.player_1.mana_slots == 1
+        assert sorted(card.mana_cost for card in back.player_0.deck.cards) == \
+               sorted(card.mana_cost for card in game.player_0.deck.cards)
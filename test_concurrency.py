@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+from pytest import fixture
+
+from concurrency import SynchronizedGame, stress, check_status
+from game import Game, Player, Deck, Card, GameError
+
+
+@fixture
+def synchronized():
+    return SynchronizedGame(Game(Player('First', Deck()), Player('Second', Deck())))
+
+
+class TestSynchronizedGame:
+    def test_status_published_after_each_move(self, synchronized):
+        before = synchronized.status
+        synchronized.finish_turn()
+        assert synchronized.status['version'] > before['version']
+        assert synchronized.status['current_player'] == 'Second'
+        assert before['current_player'] == 'First'
+
+    def test_failed_move__status_unchanged(self, synchronized):
+        before = synchronized.status
+        with pytest.raises(GameError):
+            synchronized.play_card(Card(3))
+        assert synchronized.status is before
+
+    def test_move_failing_half_way__undone(self, synchronized):
+        before = synchronized.status
+        with pytest.raises(GameError):
+            with synchronized.move() as game:
+                game.finish_turn()
+                game.attacker.health = 3
+                game.play_card(Card(3))
+        assert synchronized.status is before
+        with synchronized.move() as game:
+            assert game.attacker is game.player_0
+            assert game.player_1.health == 30
+            assert len(game.player_1.hand) == 3
+        assert synchronized.status['version'] > before['version']
+
+    def test_several_calls_in_one_move(self, synchronized):
+        with synchronized.move() as game:
+            game.finish_turn()
+            assert synchronized.status['current_player'] == 'First'
+            game.finish_turn()
+        assert synchronized.status['current_player'] == 'First'
+        assert len(synchronized.status['players']['Second']['hand']) == 4
+
+    def test_players_changed_in_a_move__published(self, synchronized):
+        with synchronized.move() as game:
+            game.attacker.mana = 4
+            game.attacker.hand = [Card(4)]
+        assert synchronized.status['players']['First']['mana'] == 4
+        assert len(synchronized.status['players']['First']['hand']) == 1
+
+    def test_reading_does_not_wait_for_moves(self, synchronized):
+        read = threading.Event()
+        with synchronized.move() as game:
+            game.finish_turn()
+            reader = threading.Thread(target=lambda: synchronized.status and read.set())
+            reader.start()
+            assert read.wait(5)
+            reader.join()
+
+    def test_play_card_of_cost(self, synchronized):
+        with synchronized.move() as game:
+            game.attacker.mana_slots = game.attacker.mana = 5
+            game.attacker.hand = [Card(2), Card(4)]
+        synchronized.play_card_of_cost(4)
+        assert synchronized.status['players']['Second']['health'] == 26
+        with pytest.raises(GameError):
+            synchronized.play_card_of_cost(7)
+
+
+class TestStress:
+    def test_readers_only_see_valid_states(self):
+        reads, _elapsed, errors = stress(num_readers=4, num_moves=3000)
+        assert errors == []
+        assert reads > 0
+
+    def test_check_status(self, synchronized):
+        status = dict(synchronized.status)
+        assert check_status(status) == []
+        status['players'] = {'First': {'health': 30, 'mana_slots': 0, 'mana': 3, 'hand': ()}}
+        assert check_status(status) == ['First: mana 3 of 0']
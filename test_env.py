@@ -0,0 +1,120 @@
+import random
+
+import numpy as np
+import pytest
+
+from env import Env, VecEnv, FINISH_TURN, NUM_ACTIONS, OBSERVATION_SIZE
+from game import Card, GameError, RuleSet
+from simulation import greedy_max_damage
+
+
+def random_legal_action(mask, rng):
+    return rng.choice(np.flatnonzero(mask).tolist())
+
+
+class TestEnv:
+    def test_first_observation(self):
+        observation, info = Env().reset(seed=0)
+        assert observation.shape == (OBSERVATION_SIZE,)
+        assert list(observation[:3]) == [30, 0, 0]
+        assert observation[3:12].sum() == 3
+        assert list(observation[12:]) == [30, 0, 3, 17, 17]
+        assert info['player'] == 0
+
+    def test_observation_of_the_player_to_act(self):
+        env = Env()
+        env.reset(seed=0)
+        observation, _reward, _terminated, _truncated, info = env.step(FINISH_TURN)
+        assert info['player'] == 1
+        assert list(observation[:3]) == [30, 1, 1]
+        assert observation[3:12].sum() == 4
+        assert list(observation[12:]) == [30, 0, 3, 16, 17]
+
+    def test_play_card_of_a_cost(self):
+        env = Env()
+        env.reset(seed=0)
+        env.game.attacker.mana_slots = env.game.attacker.mana = 5
+        env.game.attacker.hand = [Card(2), Card(4)]
+        observation, *_ = env.step(4)
+        assert observation[1] == 1
+        assert env.game.player_1.health == 26
+
+    def test_illegal_action__throw_error(self):
+        env = Env()
+        env.reset(seed=0)
+        env.game.attacker.hand = [Card(2)]
+        assert not env.action_mask()[2]
+        with pytest.raises(GameError):
+            env.step(2)
+        with pytest.raises(GameError):
+            env.step(3)
+
+    def test_self_play_until_win(self):
+        env = Env()
+        env.reset(seed=1)
+        rng = random.Random(1)
+        terminated = False
+        while not terminated:
+            _observation, reward, terminated, _truncated, _info = env.step(random_legal_action(env.action_mask(), rng))
+        assert reward == 1.0
+
+    def test_opponent_plays_its_turns(self):
+        env = Env(opponent=greedy_max_damage)
+        env.reset(seed=2)
+        terminated = False
+        rng = random.Random(2)
+        while not terminated:
+            _observation, reward, terminated, _truncated, info = env.step(random_legal_action(env.action_mask(), rng))
+            assert info['player'] == 0 or terminated
+        assert reward in (1.0, -1.0)
+
+    def test_truncated_after_max_turns(self):
+        env = Env(max_turns=3)
+        env.reset(seed=0)
+        truncated = [env.step(FINISH_TURN)[3] for _ in range(0, 3)]
+        assert truncated == [False, False, True]
+
+
+    def test_sizes_follow_the_rules(self):
+        env = Env(rules=RuleSet(start_cards_cost=[0, 1, 2, 3] * 5, start_health=12))
+        observation, _info = env.reset(seed=0)
+        assert observation.shape == (env.observation_size,) == (3 + 4 + 5,)
+        assert observation[0] == 12
+        assert env.action_mask().shape == (env.num_actions,) == (5,)
+        _observation, *_ = env.step(env.finish_turn_action)
+        assert env.game.attacker is env.game.player_1
+
+
+class TestVecEnv:
+    def test_buffers_are_reused(self):
+        envs = VecEnv(8, seed=0)
+        observations = envs.reset()
+        actions = np.full(8, FINISH_TURN)
+        assert envs.step(actions)[0] is observations
+        assert observations.shape == (8, OBSERVATION_SIZE)
+        assert (envs.players == 1).all()
+        assert envs.action_masks.shape == (8, NUM_ACTIONS)
+
+    def test_finished_games_start_again(self):
+        envs = VecEnv(4, max_turns=1, seed=0)
+        envs.reset()
+        _observations, _rewards, _terminated, truncated = envs.step(np.full(4, FINISH_TURN))
+        assert truncated.all()
+        assert (envs.players == 0).all()
+        assert (envs.observations[:, 2] == 0).all()
+
+    def test_sizes_follow_the_rules(self):
+        envs = VecEnv(2, rules=RuleSet(start_cards_cost=[0, 1, 2] * 6))
+        assert envs.reset().shape == (2, 3 + 3 + 5)
+        assert envs.action_masks.shape == (2, 4)
+
+    def test_many_games_to_the_end(self):
+        envs = VecEnv(16, seed=3)
+        envs.reset()
+        rng = random.Random(3)
+        wins = 0
+        for _ in range(0, 500):
+            actions = [random_legal_action(mask, rng) for mask in envs.action_masks]
+            _observations, rewards, _terminated, _truncated = envs.step(actions)
+            wins += int(rewards.sum())
+        assert wins > 16
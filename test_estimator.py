@@ -0,0 +1,68 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest import fixture
+
+from estimator import estimate, estimate_win_probability, wilson_interval
+from game import Game, Player, Deck, Card
+
+
+class TestEstimate:
+    @fixture
+    def game(self):
+        return Game(Player('First', Deck()), Player('Second', Deck()))
+
+    def test_lethal_card_in_hand__certain_win(self, game):
+        game.player_1.health = 3
+        game.player_0.mana = 3
+        game.player_0.hand = [Card(3)]
+        result = estimate_win_probability(game, 'First', target_half_width=0.05)
+        assert result.win_probability == 1
+        assert result.low > 0.9
+
+    def test_finished_game(self, game):
+        game.game_finished = True
+        assert estimate_win_probability(game, 'First').win_probability == 1
+        assert estimate_win_probability(game, 'Second').win_probability == 0
+
+    def test_unknown_player__throw_error(self, game):
+        with pytest.raises(ValueError):
+            estimate_win_probability(game, 'Nobody')
+
+    def test_stream_until_interval_is_tight_enough(self, game):
+        estimates = list(estimate(game, target_half_width=0.05, batch_size=20))
+        assert [e.rollouts for e in estimates] == list(range(20, 20 * len(estimates) + 1, 20))
+        last = estimates[-1]
+        assert (last.high - last.low) / 2 <= 0.05
+        assert last.low <= last.win_probability <= last.high
+
+    def test_stop_after_max_rollouts(self, game):
+        assert estimate_win_probability(game, target_half_width=0, max_rollouts=30).rollouts == 30
+
+    def test_stop_when_latency_budget_is_spent(self, game):
+        assert estimate_win_probability(game, target_half_width=0, budget_ms=0, batch_size=10).rollouts == 10
+
+    def test_does_not_change_the_game(self, game):
+        hand = game.player_0.hand.copy()
+        estimate_win_probability(game, max_rollouts=20)
+        assert game.player_0.hand == hand
+        assert game.attacker is game.player_0
+        assert game.player_1.health == 30
+
+    def test_same_result_in_a_thread_pool(self, game):
+        alone = estimate_win_probability(game, max_rollouts=200, target_half_width=0)
+        with ThreadPoolExecutor(4) as executor:
+            pooled = estimate_win_probability(game, max_rollouts=200, target_half_width=0, executor=executor)
+        assert pooled == alone
+
+
+class TestWilsonInterval:
+    def test_contains_observed_rate(self):
+        low, high = wilson_interval(30, 100)
+        assert low < 0.3 < high
+
+    def test_narrows_with_more_rollouts(self):
+        low, high = wilson_interval(300, 1000)
+        wide_low, wide_high = wilson_interval(30, 100)
+        assert high - low < wide_high - wide_low
+        assert wilson_interval(0, 0) == (0.0, 1.0)
@@ -0,0 +1,112 @@
+import random
+
+from pytest import fixture
+
+from events import EventLog, RECORD, read_events, replay, replay_game
+from game import Game, Player, Deck, Card, Event
+from simulation import play_game, greedy_max_damage, random_legal
+
+
+def costs(cards):
+    return sorted(card.mana_cost for card in cards)
+
+
+class TestEventLog:
+    @fixture
+    def game(self):
+        return Game(Player('First', Deck()), Player('Second', Deck()))
+
+    def test_records_are_fixed_width(self):
+        assert RECORD.size == 8
+
+    def test_opening_hands_are_recorded_as_draws(self, game):
+        log = EventLog()
+        log.attach(game)
+
+        records = list(RECORD.iter_unpack(log.getvalue()))
+        assert len(records) == 6
+        assert all(event == Event.DRAW for _game_id, event, _seat, _value in records)
+        assert sorted(value for _game_id, _event, seat, value in records if seat == 1) == costs(game.player_1.hand)
+
+    def test_records_moves(self, game):
+        log = EventLog()
+        log.attach(game)
+        game.player_0.mana = 5
+        game.player_0.hand = [Card(4), Card(1)]
+        game.play_card(game.player_0.hand[0])
+
+        events = [(event, seat, value) for _game_id, event, seat, value in RECORD.iter_unpack(log.getvalue())][6:]
+        assert events[:2] == [(Event.CARD_PLAYED, 0, 4), (Event.DAMAGE, 1, 4)]
+
+        game.finish_turn()
+        events = [(event, seat) for _game_id, event, seat, _value in RECORD.iter_unpack(log.getvalue())]
+        assert events[-3:] == [(Event.TURN_END, 0), (Event.DRAW, 1), (Event.MANA_REFILL, 1)]
+
+
+class TestReplay:
+    def test_replayed_game_ends_the_same(self):
+        for seed in range(0, 5):
+            log = EventLog()
+            games = []
+
+            def record(game):
+                log.attach(game)
+                games.append(game)
+
+            play_game(random_legal, greedy_max_damage, random.Random(seed), on_start=record)
+            original = games[0]
+
+            records = [(event, seat, value) for _game_id, event, seat, value in RECORD.iter_unpack(log.getvalue())]
+            replayed = replay_game(records)
+
+            assert replayed.game_finished
+            assert (replayed.attacker is replayed.player_0) == (original.attacker is original.player_0)
+            for replayed_player, player in [(replayed.player_0, original.player_0),
+                                            (replayed.player_1, original.player_1)]:
+                assert replayed_player.health == player.health
+                assert replayed_player.mana_slots == player.mana_slots
+                assert costs(replayed_player.hand) == costs(player.hand)
+                assert costs(replayed_player.deck.cards) == costs(player.deck.cards)
+
+    def test_replay_from_file(self, tmp_path):
+        path = str(tmp_path / 'events.bin')
+        results = []
+        with EventLog(path, buffer_size=64) as log:
+            for _ in range(0, 10):
+                results.append(play_game(greedy_max_damage, greedy_max_damage, on_start=log.attach))
+
+        replayed = dict(replay(read_events(path)))
+        assert sorted(replayed) == list(range(0, 10))
+        for game_id, result in enumerate(results):
+            game = replayed[game_id]
+            assert game.game_finished
+            assert (0 if game.attacker is game.player_0 else 1) == result.winner
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / 'events.bin'
+        path.write_bytes(b'')
+        assert list(read_events(str(path))) == []
+
+    def test_append_to_existing_log__new_game_ids(self, tmp_path):
+        path = str(tmp_path / 'events.bin')
+        with EventLog(path) as log:
+            for _ in range(0, 3):
+                play_game(greedy_max_damage, greedy_max_damage, on_start=log.attach)
+        with EventLog(path) as log:
+            play_game(greedy_max_damage, greedy_max_damage, on_start=log.attach)
+            assert log.games == 4
+
+        assert sorted(dict(replay(read_events(path)))) == [0, 1, 2, 3]
+
+    def test_record_cut_short__left_out(self, tmp_path):
+        path = str(tmp_path / 'events.bin')
+        with EventLog(path) as log:
+            play_game(greedy_max_damage, greedy_max_damage, on_start=log.attach)
+        records = list(read_events(path))
+        with open(path, 'ab') as file:
+            file.write(b'\x01\x00')
+        assert list(read_events(path)) == records
+
+        with EventLog(path) as log:
+            play_game(greedy_max_damage, greedy_max_damage, on_start=log.attach)
+        assert sorted(dict(replay(read_events(path)))) == [0, 1]
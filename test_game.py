@@ -1,3 +1,7 @@
+import pickle
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from unittest.mock import patch
 
 import pytest
@@ -5,7 +9,7 @@ from hypothesis import given
 from hypothesis.strategies import random_module
 from pytest import fixture
 
-from game import Deck, Card, Player, InvalidMove, Game, GameError
+from game import Deck, Card, Player, InvalidMove, Game, GameError, Hand
 
 
 class TestGame:
@@ -26,6 +30,18 @@ class TestGame:
             # TODO: Make random
             assert game.status['current_player'] == 'First'
 
+        def test_players_share_no_cards(self, p0, p1):
+            cards_0 = set(p0.deck.cards) | set(p0.hand)
+            cards_1 = set(p1.deck.cards) | set(p1.hand)
+            assert len(cards_0) == len(cards_1) == 20
+            assert not cards_0 & cards_1
+
+        def test_can_not_play_a_card_of_the_opponent(self, game, p1):
+            game.finish_turn()
+            game.finish_turn()
+            with pytest.raises(GameError):
+                game.play_card(p1.hand[0])
+
     class TestDuringTurn:
         class TestStatus:
             def test_list_players_by_name(self, game):
@@ -42,7 +58,45 @@ class TestGame:
                 assert game.status['players']['First']['health'] == 22
                 assert game.status['players']['First']['mana_slots'] == 8
                 assert game.status['players']['First']['mana'] == 3
-                assert game.status['players']['First']['hand'] == p0_hand
+                assert game.status['players']['First']['hand'] == tuple(p0_hand)
+
+            def test_hand_can_not_be_modified_through_status(self, game, p0: Player):
+                hand = game.status['players']['First']['hand']
+                with pytest.raises((TypeError, AttributeError)):
+                    hand.append(Card(3))
+                with pytest.raises(TypeError):
+                    game.status['players']['First']['hand'] = []
+                assert len(p0.hand) == 3
+
+            def test_same_snapshot_until_game_changes(self, game):
+                status = game.status
+                assert game.status is status
+
+                game.finish_turn()
+                assert game.status is not status
+                assert game.status['version'] == game.version > status['version']
+
+            def test_player_changed_directly__rebuilt(self, game, p0):
+                status = game.status
+                p0.new_turn()
+                assert game.status['players']['First']['mana_slots'] == 1
+                assert game.status['version'] > status['version']
+
+            def test_hand_changed_directly__rebuilt(self, game, p0):
+                status = game.status
+                card = Card(4)
+                p0.hand.append(card)
+                assert card in game.status['players']['First']['hand']
+                p0.hand.remove(card)
+                assert card not in game.status['players']['First']['hand']
+                assert game.status['version'] > status['version'] + 1
+                assert game.status is game.status
+
+            def test_invalid_move__version_unchanged(self, game):
+                version = game.version
+                with pytest.raises(GameError):
+                    game.play_card(Card(3))
+                assert game.version == version
 
         class TestPlayCard:
             def test_current_player_attacks_the_other_one(self, game, p0, p1):
@@ -96,6 +150,28 @@ class TestGame:
                     game.play_card(card_that_cost_3_mana)
                     finish_turn_mock.assert_called_once()
 
+                @patch.object(Game, 'finish_turn')
+                def test_when_no_card_affordable(self, finish_turn_mock, game, p0):
+                    game.attacker = p0
+
+                    p0.mana = 5
+                    card_that_cost_3_mana = Card(3)
+                    p0.hand = [card_that_cost_3_mana, Card(4), Card(7)]
+
+                    game.play_card(card_that_cost_3_mana)
+                    finish_turn_mock.assert_called_once()
+
+                @patch.object(Game, 'finish_turn')
+                def test_when_a_card_is_still_affordable__continue(self, finish_turn_mock, game, p0):
+                    game.attacker = p0
+
+                    p0.mana = 5
+                    card_that_cost_3_mana = Card(3)
+                    p0.hand = [card_that_cost_3_mana, Card(2), Card(7)]
+
+                    game.play_card(card_that_cost_3_mana)
+                    finish_turn_mock.assert_not_called()
+
                 @patch.object(Game, 'finish_turn')
                 def test_when_no_cards_in_hand(self, finish_turn_mock, game, p0):
                     game.attacker = p0
@@ -123,6 +199,107 @@ class TestGame:
                 p1_new_turn_mock.assert_called_once()
 
 
+    class TestClone:
+        def test_copy_is_independent(self, game, p0, p1):
+            clone = game.clone()
+            clone.attacker.mana = 10
+            clone.play_card(clone.attacker.hand[0])
+            clone.finish_turn()
+
+            assert len(p0.hand) == 3
+            assert p0.deck.cards_left() == 17
+            assert p1.deck.cards_left() == 17
+            assert game.attacker is p0
+
+        def test_share_cards(self, game, p0):
+            clone = game.clone()
+            assert clone.player_0.hand == p0.hand
+            assert all(a is b for a, b in zip(clone.player_0.deck.cards, p0.deck.cards))
+
+        def test_same_state(self, game, p1):
+            game.finish_turn()
+            clone = game.clone()
+            assert clone.status == game.status
+            assert clone.attacker is clone.player_1
+
+        def test_new_rng_for_decks(self, game):
+            rng = random.Random(0)
+            clone = game.clone(rng)
+            assert clone.player_0.deck.rng is rng
+            assert clone.player_1.deck.rng is rng
+
+
+    class TestSnapshot:
+        @staticmethod
+        def state(game):
+            return [(player.health, player.mana_slots, player.mana, player.hand.copy(), player.deck.cards.copy())
+                    for player in (game.player_0, game.player_1)] + [game.attacker.name, game.game_finished]
+
+        def test_restore(self, game, p0):
+            state = self.state(game)
+            snapshot = game.snapshot()
+
+            game.finish_turn()
+            game.finish_turn()
+            p0.health = 3
+            game.restore(snapshot)
+
+            assert self.state(game) == state
+
+        def test_restore_twice(self, game):
+            state = self.state(game)
+            snapshot = game.snapshot()
+            for _ in range(0, 2):
+                game.finish_turn()
+                game.restore(snapshot)
+            assert self.state(game) == state
+
+        def test_version_keeps_increasing(self, game):
+            snapshot = game.snapshot()
+            game.finish_turn()
+            version = game.version
+            game.restore(snapshot)
+            assert game.version > version
+
+    class TestUndo:
+        def test_nothing_to_undo__throw_error(self, game):
+            game.track_history()
+            with pytest.raises(GameError, match=r'(?i).*nothing to undo.*'):
+                game.undo()
+
+        def test_undo_finish_turn(self, game, p0, p1):
+            game.track_history()
+            game.finish_turn()
+            game.undo()
+            assert game.attacker is p0
+            assert len(p1.hand) == 3
+            assert p1.deck.cards_left() == 17
+
+        def test_undo_card_that_finished_the_turn(self, game, p0, p1):
+            game.track_history()
+            card = Card(3)
+            p0.mana = 3
+            p0.hand = [card]
+            game.play_card(card)
+            assert game.attacker is p1
+
+            game.undo()
+            assert game.attacker is p0
+            assert p0.hand == [card]
+            assert p0.mana == 3
+            assert p1.health == 30
+            assert p1.deck.cards_left() == 17
+            with pytest.raises(GameError):
+                game.undo()
+
+        def test_invalid_move_is_not_recorded(self, game):
+            game.track_history()
+            with pytest.raises(GameError):
+                game.play_card(Card(3))
+            with pytest.raises(GameError, match=r'(?i).*nothing to undo.*'):
+                game.undo()
+
+
 class TestPlayer:
     @fixture
     def deck(self):
@@ -149,6 +326,11 @@ class TestPlayer:
             _player = Player('Frank', Deck())
             assert draw_card_mock.call_count == 3
 
+        def test_without_opening_hand__deck_untouched(self):
+            player = Player('Frank', Deck(), draw_opening_hand=False)
+            assert len(player.hand) == 0
+            assert player.deck.cards_left() == 20
+
     class TestDrawCard:
         @patch.object(Deck, 'draw_card')
         def test_deck_not_empty__draw(self, deck_draw_card_mock, player, deck):
@@ -275,6 +457,32 @@ class TestPlayer:
             assert attack_card in hand_before_attack
             assert attack_card not in hand_after_attack
 
+    class TestPlayableCards:
+        def test_only_cards_costing_at_most_mana(self, player):
+            affordable = [Card(0), Card(3)]
+            player.hand = affordable + [Card(5)]
+            player.mana = 3
+            assert player.can_play_any()
+            assert sorted(player.playable_cards(), key=lambda card: card.mana_cost) == affordable
+
+        def test_nothing_affordable(self, player):
+            player.hand = [Card(4), Card(5)]
+            player.mana = 3
+            assert not player.can_play_any()
+            assert player.playable_cards() == []
+
+        def test_empty_hand(self, player):
+            player.hand = []
+            player.mana = 10
+            assert not player.can_play_any()
+
+        def test_follows_cards_played(self, player, other_player):
+            cheap_card = Card(1)
+            player.hand = [cheap_card, Card(6)]
+            player.mana = 5
+            player.attack(other_player, cheap_card)
+            assert not player.can_play_any()
+
     def test_health_below_zero__set_automatically_to_zero(self, player):
         player.health = -24
         assert player.health == 0
@@ -344,6 +552,125 @@ class TestDeck:
         deck.draw_card()
         assert deck.cards_left() == 2
 
+    def test_snapshot_is_not_changed_by_draws(self, deck):
+        snapshot = deck.snapshot()
+        costs = [card.mana_cost for card in snapshot]
+        deck.draw_card()
+        assert [card.mana_cost for card in snapshot] == costs
+        assert deck.cards_left() == 19
+
+    def test_from_cards__kept_as_they_are(self):
+        rng = random.Random(0)
+        state = rng.getstate()
+        cards = [Card(5), Card(1)]
+        deck = Deck.from_cards(cards, rng)
+        assert deck.cards == cards
+        assert rng.getstate() == state
+
+    def test_clone_draws_independently(self, deck):
+        clone = deck.clone()
+        clone.draw_card()
+        deck.draw_card()
+        deck.draw_card()
+        assert clone.cards_left() == 19
+        assert deck.cards_left() == 18
+
+    class TestPreshuffled:
+        @staticmethod
+        def chi_square_against_deck_costs(drawn_costs):
+            expected_share = Counter(Deck.START_CARDS_COST)
+            draws = len(drawn_costs)
+            observed = Counter(drawn_costs)
+            return sum((observed[cost] - share * draws / 20) ** 2 / (share * draws / 20)
+                       for cost, share in expected_share.items())
+
+        def test_draw_all_cards(self):
+            deck = Deck(random.Random(0), preshuffled=True)
+            drawn = [deck.draw_card().mana_cost for _ in range(0, 20)]
+            assert sorted(drawn) == Deck.START_CARDS_COST
+            with pytest.raises(RuntimeError, match=r'.*empty.*'):
+                deck.draw_card()
+
+        def test_same_seed__same_order(self):
+            deck_a = Deck(random.Random(4), preshuffled=True)
+            deck_b = Deck(random.Random(4), preshuffled=True)
+            assert [card.mana_cost for card in deck_a.cards] == [card.mana_cost for card in deck_b.cards]
+
+        def test_statistically_equivalent_to_random_draws(self):
+            # Chi-square with 8 degrees of freedom, p = 0.001
+            critical_value = 26.12
+            rng = random.Random(0)
+            for position in (0, 7, 19):
+                def drawn_at_position(preshuffled):
+                    deck = Deck(rng, preshuffled)
+                    for _ in range(0, position):
+                        deck.draw_card()
+                    return deck.draw_card().mana_cost
+
+                random_draws = [drawn_at_position(False) for _ in range(0, 4000)]
+                preshuffled_draws = [drawn_at_position(True) for _ in range(0, 4000)]
+                assert self.chi_square_against_deck_costs(random_draws) < critical_value
+                assert self.chi_square_against_deck_costs(preshuffled_draws) < critical_value
+
+        def test_numpy_generator(self):
+            numpy = pytest.importorskip('numpy')
+            deck = Deck(numpy.random.default_rng(0), preshuffled=True)
+            assert sorted(deck.draw_card().mana_cost for _ in range(0, 20)) == Deck.START_CARDS_COST
+
+
+class TestHand:
+    @fixture
+    def cards(self):
+        return [Card(1), Card(2), Card(3)]
+
+    @fixture
+    def hand(self, cards):
+        return Hand(cards)
+
+    def test_contains_its_cards_only(self, hand, cards):
+        for card in cards:
+            assert card in hand
+        assert Card(2) not in hand
+
+    def test_remove_card(self, hand, cards):
+        hand.remove(cards[0])
+        assert cards[0] not in hand
+        assert len(hand) == 2
+        assert sorted(card.mana_cost for card in hand) == [2, 3]
+
+    def test_remove_last_card(self, hand, cards):
+        hand.remove(cards[2])
+        assert hand == cards[:2]
+
+    def test_remove_card_not_in_hand__throw_error(self, hand):
+        with pytest.raises(ValueError):
+            hand.remove(Card(1))
+
+    def test_append_card_already_in_hand__throw_error(self, hand, cards):
+        with pytest.raises(ValueError):
+            hand.append(cards[0])
+        assert len(hand) == 3
+
+    def test_keep_track_of_cheapest_card(self, hand, cards):
+        assert hand.min_cost == 1
+        hand.remove(cards[0])
+        assert hand.min_cost == 2
+        hand.append(Card(0))
+        assert hand.min_cost == 0
+        assert Hand().min_cost is None
+
+    def test_count_cards_by_cost(self, hand, cards):
+        hand.append(Card(2))
+        assert hand.count_of_cost(2) == 2
+        hand.remove(cards[1])
+        assert hand.count_of_cost(2) == 1
+        assert hand.count_of_cost(8) == 0
+
+    def test_equals_list_of_same_cards(self, hand, cards):
+        assert hand == cards
+        assert hand.copy() == cards
+        assert Hand() == []
+
 
 class TestCard:
     def test_attack_power_equals_mana_cost(self):
@@ -351,3 +678,43 @@ class TestCard:
         card = Card(cost)
         assert card.mana_cost == cost
         assert card.attack_power == cost
+
+    def test_equal_cards_have_same_hash(self):
+        card = Card(3)
+        assert card == card
+        assert card != Card(3)
+        assert len({card, card, Card(3)}) == 2
+
+    def test_ids_increase(self):
+        first, second = Card(0), Card(0)
+        assert second.id > first.id
+
+    def test_batch__distinct_cards_of_the_given_costs(self):
+        cards = Card.batch([3, 0, 3])
+        assert [card.mana_cost for card in cards] == [3, 0, 3]
+        assert [card.attack_power for card in cards] == [3, 0, 3]
+        assert len(set(cards) | set(Card.batch([3, 0, 3])) | {Card(3)}) == 7
+
+    def test_batch_larger_than_an_id_range(self):
+        cards = Card.batch([1] * 300)
+        assert len(set(cards)) == 300
+
+    def test_uuid_is_generated_once(self):
+        card = Card(3)
+        assert card.uuid == card.uuid
+        assert card.uuid != Card(3).uuid
+
+    def test_copies_stay_equal(self):
+        card = Card(3)
+        uuid = card.uuid
+        card_copy = pickle.loads(pickle.dumps(card))
+        assert card_copy == card
+        assert card_copy.uuid == uuid
+
+    def test_card_from_another_process__not_equal_to_local_card_of_same_id(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            remote = executor.submit(Card, 3).result()
+        local = Card(3)
+        local.id = remote.id
+        assert local != remote
+        assert pickle.loads(pickle.dumps(remote)) == remote
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+from pytest import fixture
+
+from game import Game, Player, Deck, Card
+from instrumentation import Instrumentation
+from simulation import play_game, greedy_max_damage
+
+
+@fixture
+def instrumentation():
+    instrumentation = Instrumentation()
+    with instrumentation:
+        yield instrumentation
+
+
+@fixture
+def game():
+    return Game(Player('First', Deck()), Player('Second', Deck()))
+
+
+class TestInstrumentation:
+    def test_disabled__original_methods_are_back(self):
+        original = Game.__dict__['play_card']
+        with Instrumentation():
+            assert Game.__dict__['play_card'] is not original
+        assert Game.__dict__['play_card'] is original
+
+    def test_only_one_enabled_at_a_time(self, instrumentation):
+        with pytest.raises(RuntimeError):
+            Instrumentation().enable()
+
+    def test_count_calls_and_time(self, instrumentation, game):
+        game.finish_turn()
+        game.finish_turn()
+        assert instrumentation.calls['Game.finish_turn'] == 2
+        assert instrumentation.calls['Player.new_turn'] == 2
+        # Opening hands included
+        assert instrumentation.calls['Player._draw_card'] == 3 + 3 + 2
+        assert instrumentation.time_ns['Game.finish_turn'] >= instrumentation.time_ns['Player.new_turn'] > 0
+
+    def test_overload(self, instrumentation, game):
+        game.player_1.hand = [Card(8) for _ in range(0, 5)]
+        game.finish_turn()
+        assert instrumentation.overloads == 1
+        assert instrumentation.bleed_out_damage == 0
+
+    def test_bleed_out(self, instrumentation, game):
+        game.player_1.deck.cards = []
+        game.finish_turn()
+        assert instrumentation.bleed_out_damage == 1
+        assert instrumentation.overloads == 0
+
+    def test_turn_lengths(self, instrumentation, game):
+        game.finish_turn()
+        game.finish_turn()
+        card = Card(1)
+        game.player_0.hand = [card, Card(5)]
+        game.play_card(card)
+        assert instrumentation.turn_lengths == {0: 2, 1: 1}
+
+    def test_full_game(self, instrumentation):
+        result = play_game(greedy_max_damage, greedy_max_damage, random.Random(0))
+        assert sum(instrumentation.turn_lengths.values()) == result.turns - 1
+        assert instrumentation.calls['Player.attack'] == instrumentation.calls['Game.play_card']
+
+    def test_reset(self, instrumentation, game):
+        game.finish_turn()
+        instrumentation.reset()
+        game.finish_turn()
+        assert instrumentation.calls['Game.finish_turn'] == 1
+
+    def test_export(self, instrumentation, game):
+        game.finish_turn()
+        assert instrumentation.as_dict()['calls']['Game.finish_turn'] == 1
+        text = instrumentation.to_prometheus()
+        assert 'tcg_calls_total{method="Game.finish_turn"} 1\n' in text
+        assert 'tcg_turns_total{cards_played="0"} 1\n' in text
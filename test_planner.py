@@ -0,0 +1,66 @@
+import random
+
+from hypothesis import given
+from hypothesis.strategies import lists, integers
+
+from game import Game, Player, Deck, Card
+from planner import plan, plan_turn, brute_force, precompute
+from simulation import planned_max_damage, greedy_max_damage
+
+
+class TestPlan:
+    def test_spend_as_much_mana_as_possible(self):
+        # Greedy would play the 5 and waste 2 mana
+        assert sum(plan([5, 4, 3], 7)) == 7
+
+    def test_free_cards_first_then_most_expensive(self):
+        assert plan([3, 0, 4, 0, 1], 8) == (0, 0, 4, 3, 1)
+
+    def test_same_damage__play_more_cards(self):
+        assert plan([5, 2, 3], 5) == (3, 2)
+
+    def test_nothing_affordable(self):
+        assert plan([5, 6], 4) == ()
+
+    @given(lists(integers(0, 8), max_size=5), integers(0, 10))
+    def test_same_as_brute_force(self, costs, mana):
+        assert plan(costs, mana) == brute_force(sorted(costs), mana)
+
+    def test_precompute_every_hand(self):
+        assert precompute() >= 2002 * 11
+
+
+class TestPlanTurn:
+    def test_cards_of_the_hand_in_order(self):
+        player = Player('Frank', Deck())
+        cards = [Card(0), Card(4), Card(3), Card(5)]
+        player.hand = cards
+        player.mana = 7
+        assert plan_turn(player) == [cards[0], cards[1], cards[2]]
+
+
+class TestPlannedPolicy:
+    def test_play_the_planned_turn(self):
+        game = Game(Player('First', Deck()), Player('Second', Deck()))
+        attacker = game.attacker
+        attacker.mana_slots = attacker.mana = 7
+        cards = [Card(5), Card(4), Card(3)]
+        attacker.hand = cards
+        game.play_card(planned_max_damage(game, random))
+        game.play_card(planned_max_damage(game, random))
+        assert game.player_1.health == 30 - 7
+        assert game.attacker is not attacker
+
+    @given(lists(integers(0, 8), max_size=5), integers(0, 10))
+    def test_at_least_as_much_damage_as_greedy(self, costs, mana):
+        def damage(policy):
+            game = Game(Player('First', Deck()), Player('Second', Deck()))
+            game.attacker.mana_slots = game.attacker.mana = mana
+            game.attacker.hand = [Card(cost) for cost in costs]
+            card = policy(game, random)
+            while card is not None and game.attacker is game.player_0:
+                game.play_card(card)
+                card = policy(game, random) if game.attacker is game.player_0 else None
+            return 30 - game.player_1.health
+
+        assert damage(planned_max_damage) >= damage(greedy_max_damage)
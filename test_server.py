@@ -0,0 +1,180 @@
+import asyncio
+import json
+
+from loadgen import run_load, percentiles
+from instrumentation import Instrumentation
+from server import GameServer, Connection
+
+
+async def start_server(**kwargs):
+    server = await GameServer(**kwargs).start()
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def connect(port, table, name):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(json.dumps({'op': 'join', 'table': table, 'name': name}).encode() + b'\n')
+    return reader, writer
+
+
+async def next_message(reader, message_type):
+    while True:
+        message = json.loads(await asyncio.wait_for(reader.readline(), 5))
+        if message['type'] == message_type:
+            return message
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 30))
+
+
+class TestGameServer:
+    def test_every_table_plays_until_the_end(self):
+        async def scenario():
+            server, port = await start_server()
+            latencies, _elapsed = await run_load('127.0.0.1', port, tables=10)
+            server.close()
+            await server.wait_closed()
+            return latencies
+
+        latencies = run(scenario())
+        assert len(latencies) > 10 * 2
+        assert set(percentiles(latencies)) == {'p50', 'p90', 'p99', 'max'}
+
+    def test_game_starts_once_table_is_full(self):
+        async def scenario():
+            server, port = await start_server()
+            first, first_writer = await connect(port, 'table', 'First')
+            assert (await next_message(first, 'joined'))['seat'] == 0
+            second, second_writer = await connect(port, 'table', 'Second')
+            assert (await next_message(second, 'joined'))['seat'] == 1
+
+            status = await next_message(first, 'status')
+            assert status['current_player'] == 'First'
+            assert len(status['players']['Second']['hand']) == 3
+            first_writer.close()
+            second_writer.close()
+            server.close()
+
+        run(scenario())
+
+    def test_not_your_turn__error(self):
+        async def scenario():
+            server, port = await start_server()
+            _first, first_writer = await connect(port, 'table', 'First')
+            second, second_writer = await connect(port, 'table', 'Second')
+            await next_message(second, 'status')
+
+            second_writer.write(b'{"op": "pass"}\n')
+            error = await next_message(second, 'error')
+            first_writer.close()
+            second_writer.close()
+            server.close()
+            return error
+
+        assert 'not your turn' in run(scenario())['message'].lower()
+
+    def test_turn_timeout__finish_turn(self):
+        async def scenario():
+            server, port = await start_server(turn_timeout=0.05)
+            _first, first_writer = await connect(port, 'table', 'First')
+            second, second_writer = await connect(port, 'table', 'Second')
+            await next_message(second, 'status')
+
+            status = await next_message(second, 'status')
+            first_writer.close()
+            second_writer.close()
+            server.close()
+            return status
+
+        assert run(scenario())['current_player'] == 'Second'
+
+    def test_malformed_messages__error_and_still_connected(self):
+        async def scenario():
+            server, port = await start_server()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            errors = []
+            for line in (b'[1, 2]\n', b'"join"\n', b'{"op": "join", "table": [1], "name": "Frank"}\n',
+                         b'{"table": "t"}\n', b'not json\n'):
+                writer.write(line)
+                errors.append(await next_message(reader, 'error'))
+            writer.write(b'{"op": "join", "table": "t", "name": "Frank"}\n')
+            joined = await next_message(reader, 'joined')
+            writer.close()
+            server.close()
+            return errors, joined
+
+        errors, joined = run(scenario())
+        assert len(errors) == 5
+        assert joined['table'] == 't'
+
+    def test_message_too_long__error_then_closed(self):
+        async def scenario():
+            server, port = await start_server()
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'{"op": "' + b'x' * 70000 + b'"}\n')
+            error = await next_message(reader, 'error')
+            closed = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            server.close()
+            return error, closed
+
+        error, closed = run(scenario())
+        assert 'too long' in error['message']
+        assert closed == b''
+
+    def test_player_leaves__table_closed(self):
+        async def scenario():
+            server, port = await start_server()
+            _first, first_writer = await connect(port, 'table', 'First')
+            second, second_writer = await connect(port, 'table', 'Second')
+            await next_message(second, 'status')
+
+            first_writer.close()
+            await next_message(second, 'closed')
+            second_writer.close()
+            server.close()
+
+        run(scenario())
+
+    def test_metrics(self):
+        async def scenario():
+            with Instrumentation() as instrumentation:
+                server, port = await start_server(instrumentation=instrumentation)
+                await run_load('127.0.0.1', port, tables=2)
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(b'{"op": "metrics"}\n')
+                metrics = await next_message(reader, 'metrics')
+                writer.close()
+                server.close()
+                return metrics
+
+        assert 'tcg_calls_total{method="Game.play_card"}' in run(scenario())['text']
+
+
+class TestConnection:
+    class StalledWriter:
+        def __init__(self):
+            self.closed = False
+
+        def write(self, data):
+            pass
+
+        async def drain(self):
+            await asyncio.Event().wait()
+
+        def close(self):
+            self.closed = True
+
+    def test_client_too_slow__disconnected(self):
+        async def scenario():
+            writer = self.StalledWriter()
+            connection = Connection(None, writer, queue_size=2)
+            connection.send(b'1\n')
+            connection.send(b'2\n')
+            assert not writer.closed
+            connection.send(b'3\n')
+            await asyncio.sleep(0)
+            return writer.closed, connection._sender.cancelled()
+
+        assert run(scenario()) == (True, True)
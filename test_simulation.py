@@ -0,0 +1,77 @@
+import random
+
+from pytest import fixture
+
+from game import Game, Player, Deck, Card
+from simulation import greedy_max_damage, random_legal, pass_early, play_game, simulate, GameResult, \
+    SimulationReport
+
+
+class TestPolicies:
+    @fixture
+    def game(self):
+        game = Game(Player('First', Deck()), Player('Second', Deck()))
+        game.attacker.mana_slots = 5
+        game.attacker.mana = 5
+        return game
+
+    def test_greedy__plays_most_expensive_affordable_card(self, game):
+        best_card = Card(4)
+        game.attacker.hand = [Card(1), best_card, Card(7)]
+        assert greedy_max_damage(game, random) is best_card
+
+    def test_greedy__nothing_affordable__pass(self, game):
+        game.attacker.hand = [Card(6), Card(7)]
+        assert greedy_max_damage(game, random) is None
+
+    def test_random_legal__only_plays_affordable_cards(self, game):
+        affordable = Card(2)
+        game.attacker.hand = [affordable, Card(7)]
+        for seed in range(0, 50):
+            assert random_legal(game, random.Random(seed)) in (affordable, None)
+
+    def test_pass_early__pass_once_mana_was_spent(self, game):
+        game.attacker.hand = [Card(1), Card(2)]
+        assert pass_early(game, random) is not None
+        game.attacker.mana = 3
+        assert pass_early(game, random) is None
+
+
+class TestPlayGame:
+    def test_greedy_game_is_won_by_someone(self):
+        result = play_game(greedy_max_damage, greedy_max_damage)
+        assert result.winner in (0, 1)
+        assert result.turns > 1
+
+    def test_too_many_turns__unfinished(self):
+        result = play_game(pass_early, pass_early, max_turns=2)
+        assert result.winner is None
+        assert result.turns == 2
+
+    def test_does_not_read_status(self, monkeypatch):
+        def fail(_game):
+            raise AssertionError('status read during simulation')
+
+        monkeypatch.setattr(Game, 'status', property(fail))
+        play_game(greedy_max_damage, random_legal)
+
+
+class TestSimulationReport:
+    def test_aggregates_results(self):
+        report = SimulationReport()
+        report.add(GameResult(0, 10, False))
+        report.add(GameResult(1, 20, True))
+        report.add(GameResult(None, 200, True))
+
+        assert report.games == 3
+        assert report.wins == [1, 1]
+        assert report.unfinished == 1
+        assert report.mean_turns == 230 / 3
+        assert report.longest_game == 200
+        assert report.bleed_out_rate == 2 / 3
+
+    def test_simulate_counts_every_game(self):
+        report = simulate(20, greedy_max_damage, random_legal)
+        assert report.games == 20
+        assert sum(report.wins) + report.unfinished == 20
+        assert report.games_per_sec > 0
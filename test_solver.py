@@ -0,0 +1,88 @@
+import pytest
+from pytest import fixture
+
+from game import Game, Player, Deck, Card, RuleSet
+from solver import Solver, TranspositionTable, canonical_state
+
+
+def endgame(attacker_hand, attacker_health, victim_hand, victim_deck, victim_health, victim_slots):
+    attacker = Player('attacker', Deck())
+    victim = Player('victim', Deck())
+    attacker.hand = [Card(cost) for cost in attacker_hand]
+    attacker.deck.cards = []
+    attacker.health = attacker_health
+    attacker.mana_slots = attacker.mana = 8
+    victim.hand = [Card(cost) for cost in victim_hand]
+    victim.deck.cards = [Card(cost) for cost in victim_deck]
+    victim.health = victim_health
+    victim.mana_slots = victim_slots
+    return Game(attacker, victim)
+
+
+class TestSolver:
+    @fixture
+    def solver(self):
+        return Solver()
+
+    def test_lethal_card_in_hand__win(self, solver):
+        game = endgame([1, 8], 30, [], [], 8, 3)
+        assert solver.solve(game) == 1
+
+    def test_can_not_prevent_lethal_from_opponent__loss(self, solver):
+        game = endgame([], 5, [5], [], 10, 9)
+        assert solver.solve(game) == 0
+
+    def test_draw_decides__expected_value(self, solver):
+        # The victim wins when drawing the 8, otherwise the attacker kills it on the next turn
+        game = endgame([5], 8, [], [0, 8], 5, 7)
+        game.attacker.mana = 0
+        assert solver.solve(game) == pytest.approx(0.5)
+
+    def test_nobody_can_deal_damage_anymore__draw(self, solver):
+        game = endgame([], 8, [], [], 10, 7)
+        assert solver.solve(game) == 0.5
+
+    def test_same_costs_with_other_cards__same_state(self, solver):
+        game = endgame([1, 2], 9, [3], [4, 4], 7, 4)
+        same_game_other_cards = endgame([2, 1], 9, [3], [4, 4], 7, 4)
+        assert canonical_state(game) == canonical_state(same_game_other_cards)
+
+        solver.solve(game)
+        misses = solver.table.misses
+        solver.solve(same_game_other_cards)
+        assert solver.table.misses == misses
+        assert solver.table.hits > 0
+
+    def test_other_rules__throw_error(self, solver):
+        rules = RuleSet(start_health=12)
+        with pytest.raises(ValueError):
+            solver.solve(Game(Player('First', Deck(rules=rules)), Player('Second', Deck(rules=rules))))
+
+    def test_horizon__search_stops(self):
+        game = Game(Player('First', Deck()), Player('Second', Deck()))
+        value = Solver(horizon=2).solve(game)
+        assert 0 < value < 1
+
+
+class TestTranspositionTable:
+    def test_evict_least_recently_used(self):
+        table = TranspositionTable(max_entries=2)
+        table.put('a', 0.1)
+        table.put('b', 0.2)
+        table.get('a')
+        table.put('c', 0.3)
+
+        assert table.get('b') is None
+        assert table.get('a') == 0.1
+        assert table.stats()['evictions'] == 1
+
+    def test_stats(self):
+        table = TranspositionTable()
+        table.put(('some', 'key'), 0.5)
+        table.get(('some', 'key'))
+        table.get(('other', 'key'))
+
+        stats = table.stats()
+        assert stats['entries'] == 1
+        assert stats['hit_rate'] == 0.5
+        assert stats['approx_bytes'] > 0
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from simulation import greedy_max_damage, random_legal
+from stats import collect, play_outcome, Statistics, write_aside
+from tournament import game_rng, run_tournament
+
+
+class TestPlayOutcome:
+    def test_cards_played_add_up_to_damage(self):
+        outcome = play_outcome(greedy_max_damage, greedy_max_damage, game_rng(0, 0))
+        loser = 1 - outcome.winner
+        damage = sum(cost * count for cost, count in enumerate(outcome.cards_played[outcome.winner]))
+        assert outcome.health[loser] == 0
+        assert damage >= 30
+
+
+class TestCollect:
+    def test_same_games_as_tournament(self):
+        statistics = collect(40, random_legal, greedy_max_damage, seed=5)
+        report = run_tournament(40, random_legal, greedy_max_damage, seed=5, workers=1)
+        assert statistics.winners[:2] == report.wins
+        assert statistics.mean_turns() == report.mean_turns
+
+    def test_every_game_counted_once(self):
+        statistics = collect(25, random_legal, random_legal)
+        assert sum(statistics.winners) == sum(statistics.turns) == 25
+        assert sum(statistics.health[0]) == sum(statistics.health[1]) == 25
+
+    def test_resume_from_checkpoint(self, tmp_path):
+        checkpoint = tmp_path / 'stats.json'
+        uninterrupted = collect(30, random_legal, greedy_max_damage)
+
+        collect(20, random_legal, greedy_max_damage, checkpoint=checkpoint, checkpoint_every=7)
+        assert json.loads(checkpoint.read_text())['statistics']['games'] == 20
+        resumed = collect(30, random_legal, greedy_max_damage, checkpoint=checkpoint, checkpoint_every=7)
+
+        assert resumed.to_dict() == uninterrupted.to_dict()
+
+    def test_checkpoint_of_another_run__error(self, tmp_path):
+        checkpoint = tmp_path / 'stats.json'
+        collect(5, random_legal, greedy_max_damage, checkpoint=checkpoint)
+        with pytest.raises(ValueError):
+            collect(10, random_legal, greedy_max_damage, seed=1, checkpoint=checkpoint)
+
+
+class TestWriteAside:
+    def test_interrupted__previous_file_kept(self, tmp_path):
+        path = tmp_path / 'file.json'
+        write_aside(path, lambda file: file.write('complete'))
+
+        def interrupted(file):
+            file.write('part')
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            write_aside(path, interrupted)
+        assert path.read_text() == 'complete'
+
+
+class TestStatistics:
+    def test_merge(self):
+        first = collect(10, random_legal, random_legal, seed='a')
+        second = collect(10, random_legal, random_legal, seed='b')
+        merged = Statistics()
+        merged.merge(first)
+        merged.merge(second)
+        assert merged.games == 20
+        assert merged.winners == [a + b for a, b in zip(first.winners, second.winners)]
+
+    def test_round_trip(self):
+        statistics = collect(10, random_legal, random_legal)
+        assert Statistics.from_dict(statistics.to_dict()).to_dict() == statistics.to_dict()
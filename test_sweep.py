@@ -0,0 +1,101 @@
+import pickle
+
+import pytest
+
+from game import Game, Player, Deck, RuleSet, DEFAULT_RULES, GameError
+from simulation import greedy_max_damage, random_legal, play_game
+from sweep import grid, sweep, rules_key, evaluate
+from tournament import game_rng
+
+
+class TestRuleSet:
+    def test_defaults_match_class_constants(self):
+        assert list(DEFAULT_RULES.start_cards_cost) == Deck.START_CARDS_COST
+        assert DEFAULT_RULES.max_hand_size == Player.MAX_HAND_SIZE
+        assert DEFAULT_RULES.max_mana_slots == Player.MAX_MANA_SLOTS
+
+    def test_immutable(self):
+        with pytest.raises(AttributeError):
+            DEFAULT_RULES.start_health = 10
+
+    def test_pickled_and_hashed_by_value(self):
+        rules = RuleSet(start_health=12)
+        assert pickle.loads(pickle.dumps(rules)) == rules
+        assert len({rules, RuleSet(start_health=12), RuleSet()}) == 2
+
+    def test_decks_start_from_the_costs_of_the_rules(self):
+        rules = RuleSet(start_cards_cost=[1, 2, 3])
+        deck = Deck(rules=rules)
+        deck.draw_card()
+        assert sorted(card.mana_cost for card in Deck(rules=rules).cards) == [1, 2, 3]
+
+    def test_derived_tables(self):
+        rules = RuleSet(start_cards_cost=[0, 2, 2, 5], max_mana_slots=4)
+        assert rules.cost_histogram == (1, 0, 2, 0, 0, 1)
+
+    def test_players_follow_the_rules_of_their_deck(self):
+        rules = RuleSet(start_cards_cost=[1] * 10, start_health=12, opening_hand=4, max_hand_size=4)
+        player = Player('Frank', Deck(rules=rules))
+        assert player.health == 12
+        assert len(player.hand) == 4
+        player.new_turn()
+        assert len(player.hand) == 4
+        assert player.deck.cards_left() == 5
+
+    def test_max_mana_slots(self):
+        player = Player('Frank', Deck(rules=RuleSet(max_mana_slots=2)))
+        for _ in range(0, 3):
+            player.new_turn()
+        assert player.mana == 2
+
+    def test_players_with_different_rules__throw_error(self):
+        with pytest.raises(GameError):
+            Game(Player('First', Deck()), Player('Second', Deck(rules=RuleSet(start_health=10))))
+
+    def test_default_rules__same_games_as_before(self):
+        assert play_game(random_legal, greedy_max_damage, game_rng(0, 1), rules=RuleSet()) == \
+               play_game(random_legal, greedy_max_damage, game_rng(0, 1))
+
+
+class TestSweep:
+    def test_grid(self):
+        rule_sets = grid(start_health=[10, 20], max_hand_size=[4, 5, 6])
+        assert len(rule_sets) == 6
+        assert rule_sets[-1] == RuleSet(start_health=20, max_hand_size=6)
+
+    def test_key_depends_on_rules_and_parameters(self):
+        assert rules_key(RuleSet(), games=10) == rules_key(RuleSet(), games=10)
+        assert rules_key(RuleSet(), games=10) != rules_key(RuleSet(start_health=20), games=10)
+        assert rules_key(RuleSet(), games=10) != rules_key(RuleSet(), games=20)
+
+    def test_lower_health__shorter_games(self):
+        short, long = sweep(grid(start_health=[10, 40]), 30, greedy_max_damage, greedy_max_damage, workers=1)
+        assert short['mean_turns'] < long['mean_turns']
+
+    def test_same_results_on_many_workers(self):
+        rule_sets = grid(opening_hand=[2, 3, 4])
+        assert sweep(rule_sets, 10, random_legal, greedy_max_damage, workers=1) == \
+               sweep(rule_sets, 10, random_legal, greedy_max_damage, workers=2)
+
+    def test_cached_results_are_reused(self, tmp_path, monkeypatch):
+        rule_sets = grid(start_health=[10, 20])
+        first = sweep(rule_sets, 10, greedy_max_damage, greedy_max_damage, workers=1, cache_dir=tmp_path)
+        assert len(list(tmp_path.iterdir())) == 2
+
+        monkeypatch.setattr('sweep.evaluate', None)
+        assert sweep(rule_sets, 10, greedy_max_damage, greedy_max_damage, workers=1, cache_dir=tmp_path) == first
+        assert evaluate(rule_sets[0], 10, greedy_max_damage, greedy_max_damage) == first[0]
+
+    def test_interrupted_while_caching__result_played_again(self, tmp_path, monkeypatch):
+        rule_sets = grid(start_health=[10])
+
+        def interrupted(_summary, file):
+            file.write('{"wins": [')
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr('sweep.json.dump', interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            sweep(rule_sets, 10, greedy_max_damage, greedy_max_damage, workers=1, cache_dir=tmp_path)
+        monkeypatch.undo()
+        assert sweep(rule_sets, 10, greedy_max_damage, greedy_max_damage, workers=1, cache_dir=tmp_path) == \
+               [evaluate(rule_sets[0], 10, greedy_max_damage, greedy_max_damage)]
@@ -0,0 +1,31 @@
+from game import Deck
+from simulation import greedy_max_damage, random_legal, play_game
+from tournament import game_rng, run_tournament
+
+
+class TestSeeding:
+    def test_same_game_index__same_draws(self):
+        deck_a = Deck(game_rng(42, 7))
+        deck_b = Deck(game_rng(42, 7))
+        draws_a = [deck_a.draw_card().mana_cost for _ in range(0, 20)]
+        draws_b = [deck_b.draw_card().mana_cost for _ in range(0, 20)]
+        assert draws_a == draws_b
+
+    def test_same_seed__same_game(self):
+        result_a = play_game(random_legal, greedy_max_damage, game_rng(3, 0))
+        result_b = play_game(random_legal, greedy_max_damage, game_rng(3, 0))
+        assert result_a == result_b
+
+
+class TestRunTournament:
+    def test_result_does_not_depend_on_number_of_workers(self):
+        single_core = run_tournament(60, random_legal, greedy_max_damage, seed=1, workers=1, chunk_size=7)
+        multi_core = run_tournament(60, random_legal, greedy_max_damage, seed=1, workers=3, chunk_size=7)
+
+        assert single_core.games == 60
+        assert single_core.summary() == multi_core.summary()
+
+    def test_different_seed__different_games(self):
+        report_a = run_tournament(50, random_legal, random_legal, seed='a', workers=1)
+        report_b = run_tournament(50, random_legal, random_legal, seed='b', workers=1)
+        assert report_a.summary() != report_b.summary()
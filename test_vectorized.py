@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from pytest import fixture
+
+from game import Deck, Player
+from vectorized import VectorizedGames, simulate_vectorized, validate, START_DECK
+
+
+class TestVectorizedGames:
+    @fixture
+    def games(self):
+        return VectorizedGames(50, np.random.default_rng(0))
+
+    def test_start_with_three_cards_each(self, games):
+        assert (games.hand.sum(axis=2) == 3).all()
+        assert (games.deck.sum(axis=2) == len(Deck.START_CARDS_COST) - 3).all()
+        assert ((games.hand + games.deck) == START_DECK).all()
+
+    def test_mana_slots_only_increase_up_to_a_max_value(self, games):
+        for _ in range(0, 30):
+            games.step()
+            games.finished[:] = False
+        assert (games.mana_slots == Player.MAX_MANA_SLOTS).all()
+
+    def test_hand_full__throw_card_away__overload_special_rule(self, games):
+        games.hand[:, 1, 8] += Player.MAX_HAND_SIZE - 3
+        everyone = np.ones(games.num_games, dtype=bool)
+        games._draw_card(everyone, 1)
+        assert (games.hand[:, 1].sum(axis=1) == Player.MAX_HAND_SIZE).all()
+        assert (games.deck[:, 1].sum(axis=1) == len(Deck.START_CARDS_COST) - 4).all()
+
+    def test_deck_empty__take_damage__bleeding_out_special_rule(self, games):
+        games.deck[:, 1] = 0
+        games.step()
+        games.step()
+        assert (games.health[:, 1] == 29).all()
+        assert games.bled_out.all()
+
+    def test_every_game_finishes(self, games):
+        games.run()
+        assert games.finished.all()
+        assert (games.winner >= 0).all()
+
+
+class TestSimulateVectorized:
+    def test_batches_are_merged(self):
+        report = simulate_vectorized(250, seed=3, batch_size=100)
+        assert report.games == 250
+        assert sum(report.wins) + report.unfinished == 250
+
+    def test_outcomes_match_scalar_engine(self):
+        _scalar, _vectorized, distance = validate(3000, seed=0)
+        assert distance['win_rate'] == pytest.approx(0, abs=0.03)
+        assert distance['mean_turns'] == pytest.approx(0, abs=0.2)
@@ -0,0 +1,60 @@
+import random
+import time
+
+from simulation import play_game, SimulationReport, POLICIES, MAX_TURNS
+
+CHUNK_SIZE = 1000
+
+
+def game_rng(seed, game_index) -> random.Random:
+    # Seeding with a string goes through sha512: stable across processes, unlike `hash()`
+    return random.Random(f'{seed}:{game_index}')
+
+
+def play_chunk(policy_0, policy_1, seed, start, stop, max_turns=MAX_TURNS) -> SimulationReport:
+    report = SimulationReport()
+    for game_index in range(start, stop):
+        report.add(play_game(policy_0, policy_1, game_rng(seed, game_index), max_turns))
+    return report
+
+
+def run_tournament(num_games, policy_0, policy_1, seed=0, workers=None, chunk_size=CHUNK_SIZE,
+                   max_turns=MAX_TURNS) -> SimulationReport:
+    """
+    Shard `num_games` across a process pool.
+    Chunks only depend on `chunk_size`, never on `workers`, so the merged report is identical on any number of cores.
+    """
+    chunks = [(start, min(start + chunk_size, num_games)) for start in range(0, num_games, chunk_size)]
+
+    report = SimulationReport()
+    start_time = time.perf_counter()
+    if workers == 1:
+        for start, stop in chunks:
+            report.merge(play_chunk(policy_0, policy_1, seed, start, stop, max_turns))
+    else:
+        # Only imported when needed: `play_chunk` and `game_rng` are also used from short-lived workers
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(play_chunk, policy_0, policy_1, seed, start, stop, max_turns)
+                       for start, stop in chunks]
+            for future in futures:
+                report.merge(future.result())
+    report.elapsed = time.perf_counter() - start_time
+    return report
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Play a reproducible tournament across all cores')
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--p0', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--p1', choices=sorted(POLICIES), default='greedy')
+    parser.add_argument('--seed', default='0')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    report = run_tournament(args.games, POLICIES[args.p0], POLICIES[args.p1], args.seed, args.workers)
+    print(report)
+    print(report.summary())
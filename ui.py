@@ -10,19 +10,21 @@ if __name__ == '__main__':
     p2 = Player(p2_name, Deck())
     game = Game(p1, p2)
 
-    while not game.status['finished']:
-        pprint(game.status)
+    status = game.status
+    while not status['finished']:
+        pprint(status)
         print('')
-        print(f"It's {game.status['current_player']}'s turn")
+        print(f"It's {status['current_player']}'s turn")
         card_index = int(input('Which card? (index (<0 to pass))'))
         if card_index < 0:
             game.finish_turn()
         else:
-            card = game.status['players'][game.status['current_player']]['hand'][card_index]
+            card = status['players'][status['current_player']]['hand'][card_index]
             game.play_card(card)
             print(f"You planed {card}")
         print('')
         print('')
+        status = game.status
 
     print("Game Finished!! :D :D")
     pprint(game.status)
@@ -0,0 +1,165 @@
+import random
+import time
+
+import numpy as np
+
+from game import DEFAULT_RULES
+from simulation import SimulationReport, simulate, greedy_max_damage, MAX_TURNS
+
+START_HEALTH = DEFAULT_RULES.start_health
+START_HAND_SIZE = DEFAULT_RULES.opening_hand
+START_DECK = np.array(DEFAULT_RULES.cost_histogram, dtype=np.int16)
+NUM_COSTS = len(START_DECK)
+
+
+class VectorizedGames:
+    """
+    K games played in lockstep with the greedy policy (most expensive affordable card first).
+    Hands and decks are per-cost histograms of shape (K, 2, NUM_COSTS).
+    All games start together and alternate turns, so every unfinished game has the same attacker at each step.
+    """
+
+    def __init__(self, num_games, rng: np.random.Generator, max_turns=MAX_TURNS):
+        self.num_games = num_games
+        self.rng = rng
+        self.max_turns = max_turns
+
+        self.health = np.full((num_games, 2), START_HEALTH, dtype=np.int16)
+        self.mana_slots = np.zeros((num_games, 2), dtype=np.int16)
+        self.deck = np.tile(START_DECK, (num_games, 2, 1))
+        self.hand = np.zeros((num_games, 2, NUM_COSTS), dtype=np.int16)
+
+        self.turn = 1
+        self.finished = np.zeros(num_games, dtype=bool)
+        self.winner = np.full(num_games, -1, dtype=np.int8)
+        self.turns = np.zeros(num_games, dtype=np.int16)
+        self.bled_out = np.zeros(num_games, dtype=bool)
+
+        everyone = np.ones(num_games, dtype=bool)
+        for seat in (0, 1):
+            for _ in range(0, START_HAND_SIZE):
+                self._draw_card(everyone, seat)
+
+    @property
+    def attacker(self):
+        return (self.turn - 1) % 2
+
+    def _draw_card(self, games, seat):
+        deck = self.deck[:, seat]
+        cards_left = deck.sum(axis=1)
+
+        drawing = games & (cards_left > 0)
+        drawn_rank = self.rng.integers(0, np.maximum(cards_left, 1))
+        drawn_cost = (deck.cumsum(axis=1) > drawn_rank[:, None]).argmax(axis=1)
+        rows = np.flatnonzero(drawing)
+        deck[rows, drawn_cost[rows]] -= 1
+
+        # 'Overload' special rule
+        hand = self.hand[:, seat]
+        keeping = drawing & (hand.sum(axis=1) < DEFAULT_RULES.max_hand_size)
+        rows = np.flatnonzero(keeping)
+        hand[rows, drawn_cost[rows]] += 1
+
+        # 'Bleeding out' special rule
+        bleeding = games & (cards_left == 0)
+        self.health[bleeding, seat] = np.maximum(self.health[bleeding, seat] - 1, 0)
+        self.bled_out |= bleeding
+
+    def _new_turn(self, games, seat):
+        self._draw_card(games, seat)
+        slots = self.mana_slots[:, seat]
+        slots[games] = np.minimum(slots[games] + 1, DEFAULT_RULES.max_mana_slots)
+
+    def step(self):
+        active = ~self.finished
+        seat = self.attacker
+        if self.turn > 1:
+            self._new_turn(active, seat)
+
+        mana = np.where(active, self.mana_slots[:, seat], 0)
+        hand = self.hand[:, seat]
+        damage = np.zeros(self.num_games, dtype=np.int16)
+        played_any = np.zeros(self.num_games, dtype=bool)
+        for cost in range(NUM_COSTS - 1, 0, -1):
+            played = np.minimum(hand[:, cost], mana // cost)
+            hand[:, cost] -= played
+            mana -= played * cost
+            damage += played * cost
+            played_any |= played > 0
+
+        # Free cards come last: the turn ends automatically as soon as mana reaches 0,
+        # except on an empty mana pool (first turn) where exactly one of them gets played.
+        free_cards = hand[:, 0]
+        played = np.where(mana > 0, free_cards, np.minimum(free_cards, ~played_any & active))
+        free_cards -= played
+        played_any |= played > 0
+
+        victim = 1 - seat
+        self.health[:, victim] = np.maximum(self.health[:, victim] - damage, 0)
+
+        won = active & played_any & (self.health[:, victim] == 0)
+        self.finished |= won
+        self.winner[won] = seat
+        self.turns[won] = self.turn
+
+        if self.turn >= self.max_turns:
+            still_playing = ~self.finished
+            self.turns[still_playing] = self.max_turns
+            self.finished[:] = True
+        self.turn += 1
+
+    def run(self):
+        while not self.finished.all():
+            self.step()
+        return self
+
+    def to_report(self) -> SimulationReport:
+        report = SimulationReport()
+        report.games = self.num_games
+        report.wins = [int((self.winner == 0).sum()), int((self.winner == 1).sum())]
+        report.unfinished = int((self.winner == -1).sum())
+        report.total_turns = int(self.turns.sum(dtype=np.int64))
+        report.longest_game = int(self.turns.max()) if self.num_games else 0
+        report.bled_out = int(self.bled_out.sum())
+        return report
+
+
+def simulate_vectorized(num_games, seed=None, max_turns=MAX_TURNS, batch_size=100000) -> SimulationReport:
+    rng = np.random.default_rng(seed)
+    report = SimulationReport()
+    start = time.perf_counter()
+    for batch_start in range(0, num_games, batch_size):
+        batch = min(batch_size, num_games - batch_start)
+        report.merge(VectorizedGames(batch, rng, max_turns).run().to_report())
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def report_distance(report_a: SimulationReport, report_b: SimulationReport):
+    """Differences between two reports: win rate of the first player and mean game length."""
+    return {'win_rate'  : abs(report_a.win_rate(0) - report_b.win_rate(0)),
+            'mean_turns': abs(report_a.mean_turns - report_b.mean_turns)}
+
+
+def validate(num_games, seed=0):
+    scalar = simulate(num_games, greedy_max_damage, greedy_max_damage, random.Random(seed))
+    vectorized = simulate_vectorized(num_games, seed)
+    return scalar, vectorized, report_distance(scalar, vectorized)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Greedy games advanced in lockstep with NumPy')
+    parser.add_argument('--games', type=int, default=1000000)
+    parser.add_argument('--validate', type=int, default=0, metavar='GAMES',
+                        help='Also compare against the scalar engine over GAMES games')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    print(simulate_vectorized(args.games, args.seed))
+    if args.validate:
+        scalar, vectorized, distance = validate(args.validate, args.seed)
+        print(f'scalar:     {scalar}')
+        print(f'vectorized: {vectorized}')
+        print(f'distance:   {distance}')